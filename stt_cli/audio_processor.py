@@ -1,12 +1,93 @@
 """Audio file processing and validation."""
 
+import functools
 import logging
+import os
+import shutil
 import subprocess
 import tempfile
 from pathlib import Path
-from typing import Optional
+from typing import BinaryIO, Optional
+
+from .types import AudioConfig
+
+# Resolved once per process; None if the tool isn't on PATH
+_FFMPEG = shutil.which('ffmpeg')
+_FFPROBE = shutil.which('ffprobe')
+
+_FFMPEG_MISSING = "ffmpeg is not installed or not available in PATH"
+
+
+@functools.lru_cache(maxsize=4096)
+def _suffix_of(path_str: str) -> str:
+    """Return the lowercased file extension of a path string."""
+    return os.path.splitext(path_str)[1].lower()
+
+
+# Signatures of supported containers as (offset, magic bytes, suffix), used
+# when a file's extension is missing or unrecognized. Matroska can't be told
+# apart from WebM audio without parsing it, so it goes through the ffmpeg
+# video path; ISO media files only match audio brands, since the generic
+# brands are shared with video, HEIC/AVIF images and 3GP.
+_MAGIC = (
+    (8, b'WAVE', '.wav'),  # RIFF....WAVE
+    (0, b'OggS', '.ogg'),
+    (0, b'fLaC', '.flac'),
+    (0, b'\x1aE\xdf\xa3', '.mkv'),  # EBML (Matroska/WebM)
+    (0, b'ID3', '.mp3'),
+    (0, b'\xff\xfb', '.mp3'),  # MPEG audio frame sync without ID3 tag
+    (0, b'\xff\xf3', '.mp3'),
+    (0, b'\xff\xf2', '.mp3'),
+    (0, b'#!AMR', '.amr'),
+    (4, b'ftypM4A ', '.m4a'),  # ISO base media, audio brands only
+    (4, b'ftypM4B ', '.m4a'),
+)
+_MAGIC_LEN = 12
+
+
+def _sniff(file_path: Path) -> Optional[str]:
+    """Guess a media file's suffix from its leading bytes.
+
+    Args:
+        file_path: Path to the file
+
+    Returns:
+        Suffix of the detected format, e.g. '.wav' or '.mkv', or None if unknown
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            head = f.read(_MAGIC_LEN)
+    except OSError:
+        return None
+    for offset, magic, suffix in _MAGIC:
+        if head.startswith(magic, offset):
+            return suffix
+    return None
+
+
+@functools.lru_cache(maxsize=256)
+def _header_sample_rate(
+    path_str: str, media_format: str, mtime_ns: int, size: int
+) -> Optional[int]:
+    """Read the sample rate from an audio file header without decoding audio.
+
+    ``mtime_ns`` and ``size`` are not used directly; they are part of the
+    cache key so a modified file is read again.
+    """
+    try:
+        if media_format in ('wav', 'flac', 'ogg'):
+            import soundfile
+
+            return soundfile.info(path_str).samplerate
+        if media_format in ('mp3', 'mp4'):
+            import mutagen
 
-from .speech_client import AudioConfig
+            return mutagen.File(path_str).info.sample_rate
+    except ImportError:
+        pass
+    except Exception as e:
+        logging.getLogger(__name__).debug(f"Could not read sample rate from {path_str}: {e}")
+    return None
 
 
 class AudioProcessor:
@@ -23,10 +104,11 @@ class AudioProcessor:
         '.amr': 'amr',
         '.webm': 'webm',
     }
+    SUPPORTED_SUFFIXES: frozenset[str] = frozenset(SUPPORTED_FORMATS)
     
     # Video formats that need ffmpeg conversion
     # Note: .mp4 and .webm can contain audio-only, so they're not included here
-    VIDEO_FORMATS = {
+    VIDEO_FORMATS = frozenset({
         '.avi',
         '.mov',
         '.mkv',
@@ -36,8 +118,24 @@ class AudioProcessor:
         '.mpeg',
         '.3gp',
         '.m4v',
+    })
+
+    # Fallback sample rates when the file header can't be read. AWS Transcribe
+    # can auto-detect the rate for most formats, so we only specify it for
+    # formats that benefit from it
+    DEFAULT_SAMPLE_RATES = {
+        'wav': 16000,  # 16kHz is optimal for speech recognition
+        'flac': 16000,
+        'amr': 8000,  # AMR has fixed sample rates
     }
 
+    # MediaSampleRateHertz values AWS Transcribe accepts
+    TRANSCRIBE_SAMPLE_RATES = range(8000, 48001)
+
+    # Pipe buffer for streaming ffmpeg output, large enough that the
+    # uploader reads whole chunks rather than small fragments
+    STREAM_BUFFER_SIZE = 8 * 1024 * 1024
+
     def __init__(self):
         """Initialize the audio processor."""
         self.logger = logging.getLogger(__name__)
@@ -49,7 +147,7 @@ class AudioProcessor:
             file_path: Path to the audio file
 
         Returns:
-            AudioConfig object with file content and detected format
+            AudioConfig object referencing the file and its detected format
 
         Raises:
             ValueError: If file format is not supported
@@ -58,50 +156,49 @@ class AudioProcessor:
         if not file_path.exists():
             raise FileNotFoundError(f"Audio file not found: {file_path}")
 
+        suffix = _suffix_of(str(file_path))
+        if suffix not in self.SUPPORTED_SUFFIXES and not self._is_video_format(suffix):
+            # Missing or unknown extension: identify the file by its magic bytes
+            suffix = _sniff(file_path) or suffix
+
         # Check if it's a video file that needs conversion
-        if self._is_video_format(file_path):
-            self.logger.info(f"Detected video file {file_path.suffix}, converting to MP3...")
-            file_path = self._convert_video_to_mp3(file_path)
-            self.logger.info("Video conversion completed successfully")
+        if self._is_video_format(suffix):
+            self.logger.info(f"Detected video file {file_path.suffix}, extracting audio...")
+            return self._extract_audio(file_path)
 
         # Detect file format
-        media_format = self._detect_format(file_path)
+        media_format = self._detect_format(suffix)
         if media_format is None:
             raise ValueError(f"Unsupported audio format: {file_path.suffix}")
 
-        # Read file content
-        with open(file_path, 'rb') as f:
-            content = f.read()
-
-        # For most formats, we'll use default settings
-        # In a production system, you might want to analyze the audio
-        # to determine sample rate and channel count
+        # Read the sample rate from the file header where possible
         sample_rate = self._detect_sample_rate(file_path, media_format)
 
         return AudioConfig(
-            content=content,
+            content_path=file_path,
             media_format=media_format,
             sample_rate=sample_rate,
+            size=os.stat(file_path).st_size,
         )
 
-    def _detect_format(self, file_path: Path) -> Optional[str]:
+    def _detect_format(self, suffix: Optional[str]) -> Optional[str]:
         """Detect the audio format from file extension.
 
         Args:
-            file_path: Path to the audio file
+            suffix: Lowercased file extension, e.g. '.wav', or None
 
         Returns:
             AWS Transcribe media format string or None if unsupported
         """
-        suffix = file_path.suffix.lower()
         return self.SUPPORTED_FORMATS.get(suffix)
 
     def _detect_sample_rate(self, file_path: Path, media_format: str) -> Optional[int]:
         """Detect or estimate sample rate for the audio file.
 
-        For now, returns common default values based on format.
-        In a production system, you'd want to use a library like librosa
-        or pydub to analyze the actual audio properties.
+        The rate is read from the file header when the optional ``soundfile``
+        or ``mutagen`` packages are installed (no audio is decoded). Otherwise
+        common default values based on format are used. Rates AWS Transcribe
+        won't accept are left for it to detect.
 
         Args:
             file_path: Path to the audio file
@@ -110,29 +207,61 @@ class AudioProcessor:
         Returns:
             Sample rate in Hz or None for auto-detection
         """
-        # AWS Transcribe can auto-detect sample rate for most formats
-        # We'll only specify it for formats that benefit from it
-        if media_format in ['wav', 'flac']:
-            # For WAV and FLAC, 16kHz is optimal for speech recognition
-            return 16000
-        elif media_format == 'amr':
-            # AMR has fixed sample rates
-            return 8000
-        
-        # Let AWS auto-detect for other formats
-        return None
+        sample_rate = self._read_header_sample_rate(file_path, media_format)
+        if sample_rate is not None:
+            return sample_rate if sample_rate in self.TRANSCRIBE_SAMPLE_RATES else None
+
+        # Let AWS auto-detect for formats without a default
+        return self.DEFAULT_SAMPLE_RATES.get(media_format)
+
+    def _read_header_sample_rate(self, file_path: Path, media_format: str) -> Optional[int]:
+        """Read the sample rate from the audio file header.
+
+        Results are cached per file, and a cached rate is reused until the
+        file's modification time or size changes.
+
+        Args:
+            file_path: Path to the audio file
+            media_format: Audio format
+
+        Returns:
+            Sample rate in Hz, or None if it couldn't be read
+        """
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return None
+        return _header_sample_rate(str(file_path), media_format, st.st_mtime_ns, st.st_size)
 
     def is_supported_format(self, file_path: Path) -> bool:
         """Check if the audio file format is supported.
 
+        The extension is checked first; files with a missing or unknown
+        extension are identified by their leading bytes if they exist.
+
         Args:
             file_path: Path to the audio file
 
         Returns:
             True if format is supported, False otherwise
         """
-        suffix = file_path.suffix.lower()
-        return suffix in self.SUPPORTED_FORMATS
+        if _suffix_of(str(file_path)) in self.SUPPORTED_SUFFIXES:
+            return True
+        return _sniff(file_path) in self.SUPPORTED_SUFFIXES
+
+    def is_processable(self, file_path: Path) -> bool:
+        """Check if the file can be transcribed, directly or after conversion.
+
+        Args:
+            file_path: Path to the audio or video file
+
+        Returns:
+            True if the file is a supported audio or video format
+        """
+        suffix = _suffix_of(str(file_path))
+        if suffix in self.SUPPORTED_SUFFIXES or self._is_video_format(suffix):
+            return True
+        return _sniff(file_path) is not None
 
     def get_supported_formats(self) -> list[str]:
         """Get list of supported audio file extensions.
@@ -142,70 +271,246 @@ class AudioProcessor:
         """
         return list(self.SUPPORTED_FORMATS.keys())
 
-    def _is_video_format(self, file_path: Path) -> bool:
+    def _is_video_format(self, suffix: str) -> bool:
         """Check if the file is a video format that needs conversion.
 
         Args:
-            file_path: Path to the file
+            suffix: Lowercased file extension, e.g. '.mkv'
 
         Returns:
             True if the file is a video format, False otherwise
         """
-        suffix = file_path.suffix.lower()
         return suffix in self.VIDEO_FORMATS
 
-    def _convert_video_to_mp3(self, video_path: Path) -> Path:
-        """Convert video file to MP3 using ffmpeg.
+    def _extract_audio(self, video_path: Path) -> AudioConfig:
+        """Extract the audio track of a video file.
+
+        Audio tracks already in a codec AWS Transcribe accepts are copied
+        out of the container as-is; anything else is re-encoded to MP3.
+        MP3 output is streamed from ffmpeg so it can be uploaded while
+        extraction is still running.
 
         Args:
             video_path: Path to the video file
 
         Returns:
-            Path to the converted MP3 file
+            AudioConfig for the extracted audio
 
         Raises:
-            RuntimeError: If ffmpeg conversion fails
+            RuntimeError: If ffmpeg extraction fails
         """
-        # Create a temporary MP3 file
-        with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as tmp_file:
-            mp3_path = Path(tmp_file.name)
+        codec = self._probe_audio_codec(video_path)
+        if codec == 'aac':
+            # The MP4 muxer needs a seekable output, so AAC goes to a file
+            self.logger.debug("Copying aac audio stream without re-encoding")
+            audio_path = self._run_ffmpeg(video_path, ['-vn', '-c:a', 'copy'], '.m4a')
+            self.logger.info("Audio extraction completed successfully")
+            try:
+                audio_config = self.process_file(audio_path)
+            except Exception:
+                audio_path.unlink(missing_ok=True)
+                raise
+            # Deleted by the speech client once uploaded
+            audio_config.temporary = True
+            return audio_config
+
+        if codec == 'mp3':
+            self.logger.debug("Copying mp3 audio stream without re-encoding")
+            stream = self._stream_ffmpeg(video_path, ['-vn', '-c:a', 'copy', '-f', 'mp3'])
+        else:
+            stream = self._convert_video_to_mp3(video_path)
+
+        return AudioConfig(stream=stream, media_format='mp3')
+
+    def _probe_audio_codec(self, video_path: Path) -> Optional[str]:
+        """Detect the codec of the first audio stream using ffprobe.
 
-        try:
-            # Check if ffmpeg is available
-            result = subprocess.run(['ffmpeg', '-version'], capture_output=True, text=True)
-            if result.returncode != 0:
-                raise RuntimeError("ffmpeg is not installed or not available in PATH")
+        Args:
+            video_path: Path to the video file
 
-            # Build ffmpeg command
-            cmd = [
-                'ffmpeg',
-                '-i', str(video_path),
+        Returns:
+            Codec name (e.g. 'aac') or None if it couldn't be determined
+        """
+        if _FFPROBE is None:
+            return None
+
+        cmd = [
+            _FFPROBE,
+            '-v', 'error',
+            '-select_streams', 'a:0',
+            '-show_entries', 'stream=codec_name',
+            '-of', 'csv=p=0',
+            str(video_path),
+        ]
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        if result.returncode != 0:
+            self.logger.debug(f"ffprobe failed: {result.stderr}")
+            return None
+
+        return result.stdout.strip() or None
+
+    def _convert_video_to_mp3(self, video_path: Path) -> "FfmpegStream":
+        """Convert video file to MP3 using ffmpeg.
+
+        Args:
+            video_path: Path to the video file
+
+        Returns:
+            Stream of the converted MP3 data
+
+        Raises:
+            RuntimeError: If ffmpeg cannot be started
+        """
+        return self._stream_ffmpeg(
+            video_path,
+            [
                 '-vn',  # No video
                 '-acodec', 'mp3',
                 '-ab', '192k',  # Audio bitrate
                 '-ar', '16000',  # Sample rate optimized for speech
                 '-ac', '1',  # Mono audio
+                '-f', 'mp3',
+            ],
+        )
+
+    def _stream_ffmpeg(self, video_path: Path, output_args: list[str]) -> "FfmpegStream":
+        """Start ffmpeg on a video file, writing the audio to its stdout.
+
+        Args:
+            video_path: Path to the video file
+            output_args: ffmpeg output options, including the output format
+
+        Returns:
+            Stream over the ffmpeg output
+
+        Raises:
+            RuntimeError: If ffmpeg cannot be started
+        """
+        if _FFMPEG is None:
+            raise RuntimeError(_FFMPEG_MISSING)
+
+        cmd = [
+            _FFMPEG,
+            '-nostdin',
+            '-v', 'error',
+            '-i', str(video_path),
+            *output_args,
+            'pipe:1',
+        ]
+
+        self.logger.debug(f"Running ffmpeg command: {' '.join(cmd)}")
+
+        # stderr goes to a file rather than a pipe: nothing reads it until
+        # stdout is exhausted, and a full stderr pipe would stall ffmpeg
+        errors = tempfile.TemporaryFile()
+        try:
+            process = subprocess.Popen(
+                cmd,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=errors,
+                bufsize=self.STREAM_BUFFER_SIZE,
+            )
+        except Exception:
+            errors.close()
+            raise
+        return FfmpegStream(process, errors)
+
+    def _run_ffmpeg(self, video_path: Path, output_args: list[str], suffix: str) -> Path:
+        """Run ffmpeg on a video file, writing the audio to a temporary file.
+
+        Args:
+            video_path: Path to the video file
+            output_args: ffmpeg output options
+            suffix: Extension of the temporary output file
+
+        Returns:
+            Path to the temporary audio file
+
+        Raises:
+            RuntimeError: If ffmpeg fails
+        """
+        if _FFMPEG is None:
+            raise RuntimeError(_FFMPEG_MISSING)
+
+        # Create a temporary output file
+        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp_file:
+            audio_path = Path(tmp_file.name)
+
+        try:
+            # Build ffmpeg command
+            cmd = [
+                _FFMPEG,
+                '-nostdin',
+                '-i', str(video_path),
+                *output_args,
                 '-y',  # Overwrite output file
-                str(mp3_path)
+                str(audio_path)
             ]
 
             self.logger.debug(f"Running ffmpeg command: {' '.join(cmd)}")
 
-            # Run ffmpeg conversion
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            # Run ffmpeg
+            result = subprocess.run(
+                cmd, stdin=subprocess.DEVNULL, capture_output=True, text=True
+            )
 
             if result.returncode != 0:
                 error_msg = f"ffmpeg conversion failed: {result.stderr}"
                 self.logger.error(error_msg)
-                # Clean up temporary file on failure
-                if mp3_path.exists():
-                    mp3_path.unlink()
                 raise RuntimeError(error_msg)
 
-            return mp3_path
+            return audio_path
 
         except Exception as e:
             # Clean up temporary file on any error
-            if mp3_path.exists():
-                mp3_path.unlink()
-            raise RuntimeError(f"Failed to convert video to MP3: {str(e)}")
\ No newline at end of file
+            if audio_path.exists():
+                audio_path.unlink()
+            raise RuntimeError(f"Failed to extract audio from video: {str(e)}")
+
+
+class FfmpegStream:
+    """Readable, non-seekable stream over the output of a running ffmpeg process.
+
+    Reaching the end of the stream checks ffmpeg's exit status, so a failed
+    conversion is raised to the reader instead of passing as truncated audio.
+    """
+
+    def __init__(self, process: subprocess.Popen, errors: BinaryIO):
+        self._process = process
+        self._errors = errors
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return False
+
+    def read(self, size: int = -1) -> bytes:
+        """Read up to size bytes of ffmpeg output.
+
+        Raises:
+            RuntimeError: If ffmpeg exited with an error
+        """
+        data = self._process.stdout.read(size)
+        if not data:
+            returncode = self._process.wait()
+            if returncode != 0:
+                self._errors.seek(0)
+                stderr = self._errors.read().decode(errors='replace')
+                raise RuntimeError(f"ffmpeg conversion failed: {stderr}")
+        return data
+
+    def close(self):
+        """Stop ffmpeg if it is still running and release its output files."""
+        if self._process.poll() is None:
+            self._process.kill()
+        self._process.wait()
+        self._process.stdout.close()
+        self._errors.close()
+
+    def __enter__(self) -> "FfmpegStream":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
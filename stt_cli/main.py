@@ -9,9 +9,8 @@ from typing import Optional
 
 import click
 
-from .audio_processor import AudioProcessor
-from .output_formatter import OutputFormatter
-from .speech_client import SpeechClient
+# The pipeline modules pull in boto3, so they are imported inside the
+# commands to keep `--help` and argument errors fast.
 
 
 def format_duration(seconds: float) -> str:
@@ -31,6 +30,125 @@ def format_duration(seconds: float) -> str:
         return f"{minutes}m {remaining_seconds:.1f}s"
 
 
+def configure_logging(debug: bool) -> None:
+    """Configure logging for the CLI.
+
+    Args:
+        debug: Enable debug logging
+    """
+    level = logging.DEBUG if debug else logging.INFO
+
+    # Only install a handler once per process (batch workers inherit it)
+    if not logging.getLogger().handlers:
+        if debug:
+            log_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        else:
+            log_format = '%(levelname)s: %(message)s'
+        logging.basicConfig(level=level, format=log_format)
+
+    logging.getLogger('stt_cli').setLevel(level)
+
+
+# File extension used for batch results, per output format
+OUTPUT_EXTENSIONS = {
+    "text": "txt",
+    "json": "json",
+    "detailed": "txt",
+}
+
+
+# Options shared by the transcribe commands
+_COMMON_TRANSCRIBE_OPTIONS = [
+    click.option(
+        "--min-speakers",
+        type=int,
+        default=1,
+        help="Minimum number of speakers (1-30, default: 1)",
+    ),
+    click.option(
+        "--max-speakers",
+        type=int,
+        default=6,
+        help="Maximum number of speakers (1-30, default: 6)",
+    ),
+    click.option(
+        "--languages",
+        multiple=True,
+        help="Languages to detect (up to 4). Use language codes like 'en-US', 'he-IL'. "
+        "If not specified, defaults to 'he-IL' and 'en-US'.",
+    ),
+    click.option(
+        "--output-format",
+        type=click.Choice(["text", "json", "detailed"]),
+        default="text",
+        help="Output format (default: text)",
+    ),
+    click.option(
+        "--aws-access-key-id",
+        envvar="AWS_ACCESS_KEY_ID",
+        help="AWS access key ID. Can also be set via AWS_ACCESS_KEY_ID environment variable.",
+    ),
+    click.option(
+        "--aws-secret-access-key",
+        envvar="AWS_SECRET_ACCESS_KEY",
+        help="AWS secret access key. Can also be set via AWS_SECRET_ACCESS_KEY environment variable.",
+    ),
+    click.option(
+        "--aws-region",
+        default="us-east-1",
+        envvar="AWS_DEFAULT_REGION",
+        help="AWS region (default: us-east-1). Can also be set via AWS_DEFAULT_REGION environment variable.",
+    ),
+    click.option(
+        "--s3-bucket",
+        envvar="STT_CLI_S3_BUCKET",
+        help="S3 bucket name for audio uploads. If not specified, creates a temporary bucket. "
+        "Can also be set via STT_CLI_S3_BUCKET environment variable.",
+    ),
+    click.option(
+        "--timeout",
+        type=int,
+        default=3600,
+        envvar="STT_CLI_TIMEOUT",
+        help="Timeout in seconds for each transcription job (default: 3600). "
+        "Can also be set via STT_CLI_TIMEOUT environment variable.",
+    ),
+    click.option(
+        "--debug",
+        is_flag=True,
+        help="Enable debug logging",
+    ),
+]
+
+
+def common_transcribe_options(f):
+    """Apply the options shared by the transcribe commands."""
+    for option in reversed(_COMMON_TRANSCRIBE_OPTIONS):
+        f = option(f)
+    return f
+
+
+def _validate_args(min_speakers: int, max_speakers: int, languages: tuple[str, ...]) -> None:
+    """Validate speaker and language options, exiting on invalid input."""
+    # Validate speaker count (AWS supports up to 30 speakers)
+    if min_speakers < 1 or min_speakers > 30:
+        click.echo("Error: min-speakers must be between 1 and 30", err=True)
+        sys.exit(1)
+
+    if max_speakers < 1 or max_speakers > 30:
+        click.echo("Error: max-speakers must be between 1 and 30", err=True)
+        sys.exit(1)
+
+    if min_speakers > max_speakers:
+        click.echo("Error: min-speakers cannot be greater than max-speakers", err=True)
+        sys.exit(1)
+
+    # Validate languages (AWS supports up to 4 languages for identification)
+    if len(languages) > 4:
+        click.echo("Error: Maximum 4 languages allowed", err=True)
+        sys.exit(1)
+
+
 class DefaultGroup(click.Group):
     def get_command(self, ctx, cmd_name):
         # Only return the command if it exists
@@ -56,70 +174,12 @@ def cli():
 
 @cli.command()
 @click.argument("audio_file", required=False, type=click.Path(exists=True, path_type=Path))
-@click.option(
-    "--min-speakers",
-    type=int,
-    default=1,
-    help="Minimum number of speakers (1-10, default: 1)",
-)
-@click.option(
-    "--max-speakers",
-    type=int,
-    default=6,
-    help="Maximum number of speakers (1-30, default: 6)",
-)
-@click.option(
-    "--languages",
-    multiple=True,
-    help="Languages to detect (up to 4). Use language codes like 'en-US', 'he-IL'. "
-    "If not specified, defaults to 'he-IL' and 'en-US'.",
-)
-@click.option(
-    "--output-format",
-    type=click.Choice(["text", "json", "detailed"]),
-    default="text",
-    help="Output format (default: text)",
-)
+@common_transcribe_options
 @click.option(
     "--output-file",
     type=click.Path(path_type=Path),
     help="Output file path (default: stdout)",
 )
-@click.option(
-    "--aws-access-key-id",
-    envvar="AWS_ACCESS_KEY_ID",
-    help="AWS access key ID. Can also be set via AWS_ACCESS_KEY_ID environment variable.",
-)
-@click.option(
-    "--aws-secret-access-key",
-    envvar="AWS_SECRET_ACCESS_KEY",
-    help="AWS secret access key. Can also be set via AWS_SECRET_ACCESS_KEY environment variable.",
-)
-@click.option(
-    "--aws-region",
-    default="us-east-1",
-    envvar="AWS_DEFAULT_REGION",
-    help="AWS region (default: us-east-1). Can also be set via AWS_DEFAULT_REGION environment variable.",
-)
-@click.option(
-    "--s3-bucket",
-    envvar="STT_CLI_S3_BUCKET",
-    help="S3 bucket name for audio uploads. If not specified, creates a temporary bucket. "
-    "Can also be set via STT_CLI_S3_BUCKET environment variable.",
-)
-@click.option(
-    "--timeout",
-    type=int,
-    default=3600,
-    envvar="STT_CLI_TIMEOUT",
-    help="Timeout in seconds for transcription job (default: 3600). "
-    "Can also be set via STT_CLI_TIMEOUT environment variable.",
-)
-@click.option(
-    "--debug",
-    is_flag=True,
-    help="Enable debug logging",
-)
 def transcribe(
     audio_file: Optional[Path] = None,
     min_speakers: int = 1,
@@ -140,43 +200,18 @@ def transcribe(
         click.echo(transcribe.get_help(click.Context(transcribe)))
         sys.exit(2)
 
-    # Configure logging if debug is enabled
-    if debug:
-        logging.basicConfig(
-            level=logging.DEBUG,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        logging.getLogger('stt_cli').setLevel(logging.DEBUG)
-    else:
-        # Set up basic info logging
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(levelname)s: %(message)s'
-        )
-        logging.getLogger('stt_cli').setLevel(logging.INFO)
-    
-    # Validate speaker count (AWS supports up to 30 speakers)
-    if min_speakers < 1 or min_speakers > 30:
-        click.echo("Error: min-speakers must be between 1 and 30", err=True)
-        sys.exit(1)
+    configure_logging(debug)
 
-    if max_speakers < 1 or max_speakers > 30:
-        click.echo("Error: max-speakers must be between 1 and 30", err=True)
-        sys.exit(1)
-
-    if min_speakers > max_speakers:
-        click.echo("Error: min-speakers cannot be greater than max-speakers", err=True)
-        sys.exit(1)
-
-    # Validate languages (AWS supports up to 4 languages for identification)
-    if len(languages) > 4:
-        click.echo("Error: Maximum 4 languages allowed", err=True)
-        sys.exit(1)
+    _validate_args(min_speakers, max_speakers, languages)
 
     # Default languages if none specified (Hebrew first for better detection)
     if not languages:
         languages = ("he-IL", "en-US")  # AWS uses he-IL for Hebrew
 
+    from .audio_processor import AudioProcessor
+    from .output_formatter import OutputFormatter
+    from .speech_client import SpeechClient
+
     try:
         # Initialize components
         audio_processor = AudioProcessor()
@@ -192,9 +227,9 @@ def transcribe(
         logging.info(f"Processing audio file: {audio_file}")
         audio_config = audio_processor.process_file(audio_file)
 
-        # Check file size and inform user
-        file_size_mb = len(audio_config.content) / (1024 * 1024) if audio_config.content else 0
-        logging.info(f"File size: {file_size_mb:.1f} MB")
+        # Check file size and inform user (unknown while audio is streamed)
+        if audio_config.size_mb is not None:
+            logging.info(f"File size: {audio_config.size_mb:.1f} MB")
         
         logging.info("Uploading to S3 and starting transcription job...")
         logging.info("This may take several minutes depending on file size...")
@@ -212,15 +247,13 @@ def transcribe(
 
         logging.info("Transcription completed successfully")
 
-        # Format output
-        output = formatter.format_result(result, output_format)
-
-        # Write output
+        # Format and write output
         if output_file:
-            output_file.write_text(output, encoding="utf-8")
+            with output_file.open("w", encoding="utf-8") as f:
+                formatter.format_result(result, output_format, stream=f)
             click.echo(f"Results written to: {output_file}")
         else:
-            click.echo(output)
+            click.echo(formatter.format_result(result, output_format))
 
         logging.info(f"Transcription took {format_duration(duration)}")
 
@@ -229,5 +262,160 @@ def transcribe(
         sys.exit(1)
 
 
+def _transcribe_to_file(
+    audio_file: Path,
+    min_speakers: int,
+    max_speakers: int,
+    languages: list[str],
+    output_format: str,
+    aws_access_key_id: Optional[str],
+    aws_secret_access_key: Optional[str],
+    aws_region: str,
+    s3_bucket: Optional[str],
+    timeout: int,
+) -> Path:
+    """Transcribe a single file in a batch worker process.
+
+    The result is written next to the input as ``<input>.<ext>``.
+
+    Returns:
+        Path of the written result file
+    """
+    from .audio_processor import AudioProcessor
+    from .output_formatter import OutputFormatter
+    from .speech_client import SpeechClient
+
+    audio_processor = AudioProcessor()
+    speech_client = SpeechClient(
+        aws_access_key_id=aws_access_key_id,
+        aws_secret_access_key=aws_secret_access_key,
+        aws_region=aws_region,
+        bucket_name=s3_bucket
+    )
+
+    logging.info(f"Processing audio file: {audio_file}")
+    audio_config = audio_processor.process_file(audio_file)
+    result = speech_client.transcribe(
+        audio_config=audio_config,
+        min_speakers=min_speakers,
+        max_speakers=max_speakers,
+        languages=languages,
+        timeout=timeout,
+    )
+
+    output_file = audio_file.with_name(f"{audio_file.name}.{OUTPUT_EXTENSIONS[output_format]}")
+    with output_file.open("w", encoding="utf-8") as f:
+        OutputFormatter().format_result(result, output_format, stream=f)
+    return output_file
+
+
+@cli.command("transcribe-batch")
+@click.argument("input_dir", type=click.Path(exists=True, file_okay=False, path_type=Path))
+@click.option(
+    "--jobs",
+    type=int,
+    default=None,
+    help="Number of files to transcribe in parallel (default: number of CPUs)",
+)
+@common_transcribe_options
+def transcribe_batch(
+    input_dir: Path,
+    jobs: Optional[int] = None,
+    min_speakers: int = 1,
+    max_speakers: int = 6,
+    languages: tuple[str, ...] = (),
+    output_format: str = "text",
+    aws_access_key_id: Optional[str] = None,
+    aws_secret_access_key: Optional[str] = None,
+    aws_region: str = "us-east-1",
+    s3_bucket: Optional[str] = None,
+    timeout: int = 3600,
+    debug: bool = False,
+):
+    """Transcribe all audio and video files in a directory.
+
+    Files are processed in parallel and each result is written next to its
+    input file, e.g. meeting.mp3 -> meeting.mp3.txt.
+    """
+    configure_logging(debug)
+
+    _validate_args(min_speakers, max_speakers, languages)
+
+    if jobs is not None and jobs < 1:
+        click.echo("Error: jobs must be at least 1", err=True)
+        sys.exit(1)
+
+    # Default languages if none specified (Hebrew first for better detection)
+    if not languages:
+        languages = ("he-IL", "en-US")  # AWS uses he-IL for Hebrew
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    from .audio_processor import AudioProcessor
+    from .speech_client import SpeechClient
+
+    audio_processor = AudioProcessor()
+    audio_files = sorted(
+        path for path in input_dir.iterdir()
+        if path.is_file() and audio_processor.is_processable(path)
+    )
+    if not audio_files:
+        click.echo(f"Error: No supported audio or video files found in {input_dir}", err=True)
+        sys.exit(1)
+
+    try:
+        # Resolve the bucket once so all workers share it
+        if not s3_bucket:
+            s3_bucket = SpeechClient(
+                aws_access_key_id=aws_access_key_id,
+                aws_secret_access_key=aws_secret_access_key,
+                aws_region=aws_region,
+            )._get_or_create_bucket()
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+
+    jobs = jobs or os.cpu_count() or 1
+    logging.info(f"Transcribing {len(audio_files)} files with {jobs} workers...")
+
+    start_time = time.time()
+    failed = 0
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=configure_logging, initargs=(debug,)
+    ) as executor:
+        futures = [
+            executor.submit(
+                _transcribe_to_file,
+                audio_file,
+                min_speakers=min_speakers,
+                max_speakers=max_speakers,
+                languages=list(languages),
+                output_format=output_format,
+                aws_access_key_id=aws_access_key_id,
+                aws_secret_access_key=aws_secret_access_key,
+                aws_region=aws_region,
+                s3_bucket=s3_bucket,
+                timeout=timeout,
+            )
+            for audio_file in audio_files
+        ]
+
+        # Report in input order so output is deterministic
+        for audio_file, future in zip(audio_files, futures):
+            try:
+                output_file = future.result()
+                click.echo(f"Results written to: {output_file}")
+            except Exception as e:
+                failed += 1
+                click.echo(f"Error: {audio_file}: {e}", err=True)
+
+    duration = round(time.time() - start_time, 2)
+    logging.info(f"Batch transcription took {format_duration(duration)}")
+
+    if failed:
+        click.echo(f"Error: {failed} of {len(audio_files)} files failed", err=True)
+        sys.exit(1)
+
+
 if __name__ == "__main__":
     cli()
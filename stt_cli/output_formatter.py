@@ -1,86 +1,127 @@
 """Output formatting for transcription results."""
 
+import io
 import json
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, TextIO, Union
 
-from .speech_client import TranscriptionResult
+try:
+    import orjson
+except ImportError:  # optional speedup, see the 'fast' extra
+    orjson = None
+
+from .types import TranscriptionResult
+
+NO_RESULTS_MESSAGE = "No transcription results found."
+
+
+def _dumps_indented(obj: dict[str, Any], indent: str) -> str:
+    """Serialize obj as 2-space indented JSON nested at the given indent."""
+    if orjson is not None:
+        text = orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    else:
+        text = json.dumps(obj, indent=2, ensure_ascii=False)
+    # JSON strings never contain raw newlines, so this only re-indents lines
+    return text.replace("\n", "\n" + indent)
+
+
+@dataclass(frozen=True)
+class Summary:
+    """Totals shown in the JSON and detailed output formats."""
+
+    total_segments: int
+    speakers: int
+    languages: tuple[str, ...]  # in order of first appearance
 
 
 class OutputFormatter:
     """Formats transcription results in various output formats."""
 
-    def __init__(self):
+    def __init__(self) -> None:
         """Initialize the output formatter."""
-        pass
+        # Writers by format type; each writes the formatted results to a stream
+        self._writers: dict[str, Callable[[list[TranscriptionResult], TextIO], None]] = {
+            "text": self._write_text,
+            "json": self._write_json,
+            "detailed": self._write_detailed,
+        }
 
-    def format_result(self, results: list[TranscriptionResult], format_type: str) -> str:
+    def format_result(
+        self,
+        results: list[TranscriptionResult],
+        format_type: str,
+        stream: Optional[TextIO] = None,
+    ) -> Optional[str]:
         """Format transcription results.
 
         Args:
             results: List of transcription results
             format_type: Output format ('text', 'json', 'detailed')
+            stream: Optional text stream to write the output to incrementally
 
         Returns:
-            Formatted string output
+            Formatted string output, or None if it was written to ``stream``
         """
         if not results:
-            return "No transcription results found."
-
-        if format_type == "text":
-            return self._format_text(results)
-        elif format_type == "json":
-            return self._format_json(results)
-        elif format_type == "detailed":
-            return self._format_detailed(results)
-        else:
-            raise ValueError(f"Unsupported format type: {format_type}")
-
-    def _format_text(self, results: list[TranscriptionResult]) -> str:
-        """Format results as simple text with speaker labels.
+            if stream is None:
+                return NO_RESULTS_MESSAGE
+            stream.write(NO_RESULTS_MESSAGE)
+            return None
+
+        if stream is None:
+            buffer = io.StringIO()
+            self.format_result(results, format_type, buffer)
+            return buffer.getvalue()
+
+        try:
+            writer = self._writers[format_type]
+        except KeyError:
+            raise ValueError(f"Unsupported format type: {format_type}") from None
+        writer(results, stream)
+        return None
+
+    def _write_text(self, results: list[TranscriptionResult], stream: TextIO) -> None:
+        """Write results as simple text with speaker labels.
 
         Args:
             results: List of transcription results
-
-        Returns:
-            Plain text format with speaker labels
+            stream: Text stream to write to
         """
-        lines = []
-        current_speaker = "INITIAL"  # Use sentinel value to ensure first speaker is always shown
-
-        for result in results:
-            speaker_label = f"Speaker {result.speaker_tag}" if result.speaker_tag else "Unknown Speaker"
+        write = stream.write
+        current_speaker: Union[int, str, None] = "INITIAL"  # Use sentinel value to ensure first speaker is always shown
+        headings: dict[Optional[int], str] = {}  # speaker_tag -> "[label]" line; speakers alternate often
 
+        for i, result in enumerate(results):
             # Group consecutive segments from the same speaker
             if result.speaker_tag != current_speaker:
-                if lines:  # Add empty line between speakers
-                    lines.append("")
-                lines.append(f"[{speaker_label}]")
+                heading = headings.get(result.speaker_tag)
+                if heading is None:
+                    speaker_label = f"Speaker {result.speaker_tag}" if result.speaker_tag else "Unknown Speaker"
+                    heading = headings[result.speaker_tag] = f"[{speaker_label}]\n"
+                if i:  # Add empty line between speakers
+                    write("\n\n")
+                write(heading)
                 current_speaker = result.speaker_tag
+            else:
+                write("\n")
 
-            lines.append(result.transcript)
+            write(result.transcript)
 
-        return "\n".join(lines)
+    def _write_json(self, results: list[TranscriptionResult], stream: TextIO) -> None:
+        """Write results as JSON, one segment at a time.
 
-    def _format_json(self, results: list[TranscriptionResult]) -> str:
-        """Format results as JSON.
+        The output is identical to serializing the whole document with
+        ``indent=2``, without first building the full segment list.
 
         Args:
             results: List of transcription results
-
-        Returns:
-            JSON formatted string
+            stream: Text stream to write to
         """
-        data = {
-            "transcription": {
-                "segments": [],
-                "summary": {
-                    "total_segments": len(results),
-                    "speakers": len({r.speaker_tag for r in results if r.speaker_tag}),
-                    "languages": list({r.language_code for r in results if r.language_code != "unknown"}),
-                }
-            }
-        }
-
+        stream.write('{\n  "transcription": {\n    "segments": [\n')
         for i, result in enumerate(results):
+            if i:
+                stream.write(",\n")
             segment = {
                 "id": i + 1,
                 "transcript": result.transcript,
@@ -88,47 +129,83 @@ class OutputFormatter:
                 "speaker_tag": result.speaker_tag,
                 "language_code": result.language_code,
             }
-            data["transcription"]["segments"].append(segment)
+            stream.write("      " + _dumps_indented(segment, "      "))
 
-        return json.dumps(data, indent=2, ensure_ascii=False)
+        summary = self._summarize(results)
+        summary_json = {
+            "total_segments": summary.total_segments,
+            "speakers": summary.speakers,
+            "languages": list(summary.languages),
+        }
+        stream.write('\n    ],\n    "summary": ')
+        stream.write(_dumps_indented(summary_json, "    "))
+        stream.write("\n  }\n}")
+
+    def _write_detailed(self, results: list[TranscriptionResult], stream: TextIO) -> None:
+        """Write results with detailed information.
 
-    def _format_detailed(self, results: list[TranscriptionResult]) -> str:
-        """Format results with detailed information.
+        The summary is collected first, then each segment is written as it
+        is formatted.
 
         Args:
             results: List of transcription results
-
-        Returns:
-            Detailed text format with metadata
+            stream: Text stream to write to
         """
-        lines = []
+        write = stream.write
+        summary = self._summarize(results)
 
         # Summary
-        speakers = {r.speaker_tag for r in results if r.speaker_tag}
-        languages = {r.language_code for r in results if r.language_code != "unknown"}
-
-        lines.append("=== TRANSCRIPTION SUMMARY ===")
-        lines.append(f"Total segments: {len(results)}")
-        lines.append(f"Speakers detected: {len(speakers)}")
-        lines.append(f"Languages detected: {', '.join(languages) if languages else 'Unknown'}")
-        lines.append("")
+        write(
+            "=== TRANSCRIPTION SUMMARY ===\n"
+            f"Total segments: {summary.total_segments}\n"
+            f"Speakers detected: {summary.speakers}\n"
+            f"Languages detected: {', '.join(summary.languages) if summary.languages else 'Unknown'}\n"
+            "\n"
+            "=== DETAILED TRANSCRIPTION ===\n"
+            "\n"
+        )
 
         # Detailed segments
-        lines.append("=== DETAILED TRANSCRIPTION ===")
-        lines.append("")
-
+        labels: dict[Optional[int], str] = {}  # speaker_tag -> label; tags repeat across segments
         for i, result in enumerate(results, 1):
-            speaker_label = f"Speaker {result.speaker_tag}" if result.speaker_tag else "Unknown"
-            confidence_pct = int(result.confidence * 100) if result.confidence else 0
+            speaker_label = labels.get(result.speaker_tag)
+            if speaker_label is None:
+                speaker_label = f"Speaker {result.speaker_tag}" if result.speaker_tag else "Unknown"
+                labels[result.speaker_tag] = speaker_label
+            confidence_pct = round(result.confidence * 100) if result.confidence else 0
+
+            if i > 1:  # Blank line between segments
+                write("\n")
+            write(
+                f"Segment {i}:\n"
+                f"  Speaker: {speaker_label}\n"
+                f"  Language: {result.language_code}\n"
+                f"  Confidence: {confidence_pct}%\n"
+                f"  Transcript: {result.transcript}\n"
+            )
+
+    def _summarize(self, results: list[TranscriptionResult]) -> Summary:
+        """Count segments, speakers and languages in a single pass.
+
+        Args:
+            results: List of transcription results
 
-            lines.append(f"Segment {i}:")
-            lines.append(f"  Speaker: {speaker_label}")
-            lines.append(f"  Language: {result.language_code}")
-            lines.append(f"  Confidence: {confidence_pct}%")
-            lines.append(f"  Transcript: {result.transcript}")
-            lines.append("")
+        Returns:
+            Summary of the results
+        """
+        speakers: set[int] = set()
+        languages: dict[str, None] = {}  # insertion-ordered set
+        for result in results:
+            if result.speaker_tag:
+                speakers.add(result.speaker_tag)
+            if result.language_code != "unknown":
+                languages[result.language_code] = None
 
-        return "\n".join(lines)
+        return Summary(
+            total_segments=len(results),
+            speakers=len(speakers),
+            languages=tuple(languages),
+        )
 
     def _group_by_speaker(self, results: list[TranscriptionResult]) -> dict[int, list[TranscriptionResult]]:
         """Group results by speaker.
@@ -139,11 +216,8 @@ class OutputFormatter:
         Returns:
             Dictionary mapping speaker_tag to list of results
         """
-        groups = {}
+        groups: defaultdict[int, list[TranscriptionResult]] = defaultdict(list)
         for result in results:
-            speaker_tag = result.speaker_tag or 0  # Use 0 for unknown speakers
-            if speaker_tag not in groups:
-                groups[speaker_tag] = []
-            groups[speaker_tag].append(result)
+            groups[result.speaker_tag or 0].append(result)  # Use 0 for unknown speakers
 
-        return groups
+        return dict(groups)
@@ -1,43 +1,173 @@
 """AWS Transcribe client wrapper with speaker diarization."""
 
+import asyncio
+import functools
 import json
 import logging
+import os
+import random
+import secrets
 import time
-import uuid
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 from pathlib import Path
-from typing import Optional
+from typing import BinaryIO, Optional
 
-import boto3
-from botocore.exceptions import ClientError
+try:
+    import orjson
+except ImportError:  # optional speedup, see the 'fast' extra
+    orjson = None
+
+from .types import AudioConfig, TranscriptionResult
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# boto3 takes longer to import than the rest of the CLI put together, so it
+# is only loaded once a client is actually created
+_boto3 = None
 
-class AudioConfig:
-    """Configuration for audio input."""
-    
-    def __init__(
-        self,
-        content: Optional[bytes] = None,
-        uri: Optional[str] = None,
-        media_format: str = "mp3",
-        sample_rate: Optional[int] = None,
-    ):
-        self.content = content
-        self.uri = uri
-        self.media_format = media_format
-        self.sample_rate = sample_rate
+
+def _import_boto3():
+    """Import boto3 on first use and return the module."""
+    global _boto3
+    if _boto3 is None:
+        import boto3
+        import boto3.s3.transfer
+        _boto3 = boto3
+    return _boto3
+
+
+@functools.cache
+def _upload_config():
+    """Return the multipart settings for audio uploads.
+
+    Parts are sent concurrently, which also lets streamed input upload while
+    it is still being produced. Smaller parts keep the memory buffered for
+    piped ffmpeg output bounded.
+    """
+    return _import_boto3().s3.transfer.TransferConfig(
+        multipart_threshold=8 * 1024 * 1024,
+        multipart_chunksize=8 * 1024 * 1024,
+        max_concurrency=8,
+        use_threads=True,
+    )
+
+
+# (content, confidence) of a transcript item alternative
+_content_and_confidence = itemgetter('content', 'confidence')
+
+# AWS uses different codes for some languages
+_LANG_MAP = {
+    'iw-IL': 'he-IL',  # AWS uses he-IL for Hebrew
+    'he-IL': 'he-IL',
+}
+
+# Transcription job polling: the delay between status checks starts short so
+# quick jobs return promptly, then backs off to limit API calls on long jobs
+POLL_INITIAL_DELAY = 1.0
+POLL_MAX_DELAY = 15.0
+POLL_BACKOFF = 1.5
+
+
+def _poll_delays() -> Iterator[float]:
+    """Yield exponentially increasing delays with up to 25% jitter."""
+    delay = POLL_INITIAL_DELAY
+    while True:
+        yield delay + random.uniform(0, 0.25 * delay)
+        delay = min(delay * POLL_BACKOFF, POLL_MAX_DELAY)
+
+
+@functools.lru_cache(maxsize=8)
+def _get_session(
+    aws_region: str, aws_access_key_id: Optional[str], aws_secret_access_key: Optional[str]
+):
+    """Return the process-wide boto3 session for the given credentials."""
+    return _import_boto3().Session(
+        aws_access_key_id=aws_access_key_id,
+        aws_secret_access_key=aws_secret_access_key,
+        region_name=aws_region
+    )
+
+
+@functools.lru_cache(maxsize=8)
+def _get_clients(
+    aws_region: str, aws_access_key_id: Optional[str], aws_secret_access_key: Optional[str]
+):
+    """Return the process-wide (transcribe, s3) clients for the given credentials.
+
+    Building a session and its clients resolves credentials and loads the
+    botocore service models, so it is done once per region and credentials.
+    """
+    session = _get_session(aws_region, aws_access_key_id, aws_secret_access_key)
+    return session.client('transcribe'), session.client('s3')
 
 
-class TranscriptionResult:
-    """Result of speech transcription with speaker information."""
+# Background S3 housekeeping that callers don't need to wait for, shared by
+# all clients; pending work is finished before the interpreter exits
+_background_pool: Optional[ThreadPoolExecutor] = None
+
+
+def _get_background_pool() -> ThreadPoolExecutor:
+    """Return the process-wide pool for background S3 cleanup."""
+    global _background_pool
+    if _background_pool is None:
+        _background_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='stt-cli-cleanup')
+    return _background_pool
+
+
+def _reset_after_fork() -> None:
+    """Drop process state that a forked child must not inherit."""
+    global _background_pool
+    # boto3 clients are not fork-safe, so a forked child (such as a
+    # transcribe-batch worker) builds its own instead of reusing the
+    # parent's connection pools
+    _get_session.cache_clear()
+    _get_clients.cache_clear()
+    # The parent's pool threads don't exist in the child
+    _background_pool = None
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+# Upload buckets created by the CLI are remembered per AWS credentials and
+# region, so later runs reuse them instead of creating a new bucket each time
+BUCKET_CACHE_PATH = (
+    Path(os.environ.get('XDG_CACHE_HOME') or '~/.cache').expanduser() / 'stt-cli' / 'buckets.json'
+)
+
+# HeadBucket errors for a cached bucket that was deleted or is not ours
+_STALE_BUCKET_ERRORS = frozenset({'404', '403', 'NoSuchBucket', 'AccessDenied'})
+
+
+def _read_bucket_cache() -> dict[str, str]:
+    """Return the cached bucket names by credentials and region."""
+    try:
+        with open(BUCKET_CACHE_PATH, 'rb') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _write_bucket_cache(cache_key: str, bucket_name: str) -> None:
+    """Remember the bucket for the credentials and region."""
+    cache = _read_bucket_cache()
+    cache[cache_key] = bucket_name
     
-    def __init__(self, transcript: str, confidence: float, language_code: str, speaker_tag: Optional[int] = None):
-        self.transcript = transcript
-        self.confidence = confidence
-        self.language_code = language_code
-        self.speaker_tag = speaker_tag
+    try:
+        BUCKET_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename so concurrent runs never see a partial file
+        tmp_path = BUCKET_CACHE_PATH.with_name(f"{BUCKET_CACHE_PATH.name}.{os.getpid()}")
+        with open(tmp_path, 'w') as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, BUCKET_CACHE_PATH)
+    except OSError as e:
+        logger.debug(f"Could not update bucket cache: {e}")
 
 
 class SpeechClient:
@@ -54,14 +184,10 @@ class SpeechClient:
             bucket_name: S3 bucket name for audio uploads.
         """
         # Initialize AWS clients
-        session = boto3.Session(
-            aws_access_key_id=aws_access_key_id,
-            aws_secret_access_key=aws_secret_access_key,
-            region_name=aws_region
+        self.session = _get_session(aws_region, aws_access_key_id, aws_secret_access_key)
+        self.transcribe_client, self.s3_client = _get_clients(
+            aws_region, aws_access_key_id, aws_secret_access_key
         )
-        
-        self.transcribe_client = session.client('transcribe')
-        self.s3_client = session.client('s3')
         self.aws_region = aws_region
         self.bucket_name = bucket_name
         self._temp_bucket = None
@@ -71,7 +197,7 @@ class SpeechClient:
         audio_config: AudioConfig,
         min_speakers: int = 1,
         max_speakers: int = 6,
-        languages: list[str] | None = None,
+        languages: Optional[list[str]] = None,
         timeout: int = 3600,
     ) -> list[TranscriptionResult]:
         """Transcribe audio with speaker diarization and language detection.
@@ -90,83 +216,222 @@ class SpeechClient:
             languages = ["he-IL", "en-US"]  # Hebrew first for better detection
         
         # Prepare audio for transcription
-        if audio_config.content:
-            # Upload to S3 and get URI
-            s3_uri = self._upload_to_s3(audio_config.content, audio_config.media_format)
-        elif audio_config.uri:
-            s3_uri = audio_config.uri
-        else:
-            raise ValueError("Either audio content or URI must be provided")
+        s3_uri, uploaded = self._prepare_audio(audio_config)
         
         # Start transcription job
-        job_name = f"stt-cli-{uuid.uuid4().hex[:8]}-{int(time.time())}"
+        job_name = f"stt-cli-{secrets.token_hex(4)}-{int(time.time())}"
         
         try:
-            # Configure transcription job
-            job_config = {
-                'TranscriptionJobName': job_name,
-                'Media': {'MediaFileUri': s3_uri},
-                'MediaFormat': audio_config.media_format,
-                'LanguageCode': self._convert_language_code(languages[0]),
-                'Settings': {
-                    'ShowSpeakerLabels': True,
-                    'MaxSpeakerLabels': max_speakers,
-                    'ShowAlternatives': True,
-                    'MaxAlternatives': 2,
-                }
-            }
-            
-            # Add sample rate if specified
-            if audio_config.sample_rate:
-                job_config['MediaSampleRateHertz'] = audio_config.sample_rate
-            
-            # Add language identification if multiple languages
-            if len(languages) > 1:
-                job_config['IdentifyLanguage'] = True
-                job_config['LanguageOptions'] = [self._convert_language_code(lang) for lang in languages[:4]]
-                # Remove LanguageCode when using IdentifyLanguage
-                del job_config['LanguageCode']
-            
-            logger.info(f"Starting transcription job: {job_name}")
-            self.transcribe_client.start_transcription_job(**job_config)
+            self._start_job(job_name, s3_uri, audio_config, max_speakers, languages)
             
             # Wait for completion
             result = self._wait_for_completion(job_name, timeout=timeout)
             
-            # Clean up temporary S3 file if we uploaded it
-            if audio_config.content:
-                self._cleanup_s3_file(s3_uri)
-            
-            return self._parse_response(result)
-            
         except Exception as e:
             # Clean up on error
-            if audio_config.content:
+            if uploaded:
                 try:
                     self._cleanup_s3_file(s3_uri)
                 except Exception:
                     pass
             raise e
+        
+        # Clean up temporary S3 file if we uploaded it, in the background
+        # while the transcript is downloaded and parsed
+        if uploaded:
+            _get_background_pool().submit(self._cleanup_s3_file, s3_uri)
+        
+        return self._parse_response(result)
+    
+    async def transcribe_async(
+        self,
+        audio_config: AudioConfig,
+        min_speakers: int = 1,
+        max_speakers: int = 6,
+        languages: Optional[list[str]] = None,
+        timeout: int = 3600,
+    ) -> list[TranscriptionResult]:
+        """Asynchronous variant of :meth:`transcribe`.
+
+        Blocking AWS calls run in worker threads and the job is polled with
+        ``asyncio.sleep``, so several transcriptions can upload and wait
+        concurrently on one event loop.
+
+        Args:
+            audio_config: Audio configuration
+            min_speakers: Minimum number of speakers
+            max_speakers: Maximum number of speakers
+            languages: List of language codes for transcription
+            timeout: Timeout in seconds for transcription job (default: 3600)
+
+        Returns:
+            List of transcription results with speaker information
+        """
+        if languages is None:
+            languages = ["he-IL", "en-US"]  # Hebrew first for better detection
+        
+        s3_uri, uploaded = await asyncio.to_thread(self._prepare_audio, audio_config)
+        
+        job_name = f"stt-cli-{secrets.token_hex(4)}-{int(time.time())}"
+        
+        try:
+            await asyncio.to_thread(
+                self._start_job, job_name, s3_uri, audio_config, max_speakers, languages
+            )
+            
+            result = await self._wait_for_completion_async(job_name, timeout=timeout)
+            
+        except Exception as e:
+            if uploaded:
+                try:
+                    await asyncio.to_thread(self._cleanup_s3_file, s3_uri)
+                except Exception:
+                    pass
+            raise e
+        
+        parse = asyncio.to_thread(self._parse_response, result)
+        if not uploaded:
+            return await parse
+        
+        # Clean up the uploaded audio while the transcript is parsed
+        _, results = await asyncio.gather(
+            asyncio.to_thread(self._cleanup_s3_file, s3_uri), parse
+        )
+        return results
+    
+    def _prepare_audio(self, audio_config: AudioConfig) -> tuple[str, bool]:
+        """Upload local audio to S3 if needed.
+
+        Returns:
+            Tuple of the S3 URI of the audio and whether it was uploaded by us
+        """
+        if audio_config.stream is not None:
+            # Upload the stream as it is produced and get URI
+            with audio_config.stream as stream:
+                return self._upload_to_s3(stream, audio_config.media_format), True
+        elif audio_config.content_path is not None:
+            # Stream the local file to S3 and get URI
+            try:
+                with audio_config.open_content() as f:
+                    return self._upload_to_s3(f, audio_config.media_format), True
+            finally:
+                if audio_config.temporary:
+                    audio_config.content_path.unlink(missing_ok=True)
+        elif audio_config.uri:
+            return audio_config.uri, False
+        else:
+            raise ValueError("Either audio content or URI must be provided")
+    
+    def _start_job(
+        self,
+        job_name: str,
+        s3_uri: str,
+        audio_config: AudioConfig,
+        max_speakers: int,
+        languages: list[str],
+    ):
+        """Configure and start a transcription job."""
+        job_config = {
+            'TranscriptionJobName': job_name,
+            'Media': {'MediaFileUri': s3_uri},
+            'MediaFormat': audio_config.media_format,
+            'LanguageCode': _LANG_MAP.get(languages[0], languages[0]),
+            'Settings': {
+                'ShowSpeakerLabels': True,
+                'MaxSpeakerLabels': max_speakers,
+                'ShowAlternatives': True,
+                'MaxAlternatives': 2,
+            }
+        }
+        
+        # Add sample rate if specified
+        if audio_config.sample_rate:
+            job_config['MediaSampleRateHertz'] = audio_config.sample_rate
+        
+        # Add language identification if multiple languages
+        if len(languages) > 1:
+            job_config['IdentifyLanguage'] = True
+            job_config['LanguageOptions'] = [_LANG_MAP.get(lang, lang) for lang in languages[:4]]
+            # Remove LanguageCode when using IdentifyLanguage
+            del job_config['LanguageCode']
+        
+        logger.info(f"Starting transcription job: {job_name}")
+        self.transcribe_client.start_transcription_job(**job_config)
     
     def _convert_language_code(self, code: str) -> str:
         """Convert language codes to AWS format."""
         # AWS uses different codes for some languages
-        conversion_map = {
-            'iw-IL': 'he-IL',  # AWS uses he-IL for Hebrew
-            'he-IL': 'he-IL',
-        }
-        return conversion_map.get(code, code)
+        return _LANG_MAP.get(code, code)
     
     def _get_or_create_bucket(self) -> str:
-        """Get or create an S3 bucket for audio uploads."""
+        """Get or create an S3 bucket for audio uploads.
+
+        A bucket created here is cached on disk for the credentials and region
+        and reused by later runs, as long as it still exists and is ours.
+        """
         if self.bucket_name:
             return self.bucket_name
             
         if self._temp_bucket:
             return self._temp_bucket
-            
+        
+        cache_key = self._bucket_cache_key()
+        cached = _read_bucket_cache().get(cache_key) if cache_key else None
+        if cached:
+            if self._bucket_exists(cached):
+                logger.debug(f"Using cached S3 bucket: {cached}")
+                self._temp_bucket = cached
+                return cached
+            logger.debug(f"Cached S3 bucket {cached} is gone or not ours, creating a new one")
+        
+        self._temp_bucket = self._create_bucket()
+        if cache_key:
+            _write_bucket_cache(cache_key, self._temp_bucket)
+        return self._temp_bucket
+    
+    def _bucket_cache_key(self) -> Optional[str]:
+        """Return the bucket cache key for the current credentials and region.
+
+        Long-term credentials are identified by their access key ID, without
+        a network call. Temporary credentials get a new access key each time
+        they are issued, so for those the account is looked up with STS.
+
+        Returns:
+            "<access key id>/<region>" or "<account>/<region>", or None if
+            the credentials can't be determined
+        """
+        from botocore.exceptions import BotoCoreError, ClientError
+        
+        try:
+            credentials = self.session.get_credentials()
+            if credentials is None:
+                return None
+            if not credentials.token:
+                return f"{credentials.access_key}/{self.aws_region}"
+            account = self.session.client('sts').get_caller_identity()['Account']
+        except (BotoCoreError, ClientError) as e:
+            logger.debug(f"Could not determine AWS credentials, not caching bucket: {e}")
+            return None
+        return f"{account}/{self.aws_region}"
+    
+    def _bucket_exists(self, bucket_name: str) -> bool:
+        """Check that a bucket exists and is accessible with our credentials."""
+        from botocore.exceptions import ClientError
+        
+        try:
+            self.s3_client.head_bucket(Bucket=bucket_name)
+        except ClientError as e:
+            if e.response['Error']['Code'] in _STALE_BUCKET_ERRORS:
+                return False
+            raise
+        return True
+    
+    def _create_bucket(self) -> str:
+        """Create a new S3 bucket for audio uploads and return its name."""
+        from botocore.exceptions import ClientError
+        
         # Create bucket name
-        bucket_name = f"stt-cli-audio-{uuid.uuid4().hex[:8]}"
+        bucket_name = f"stt-cli-audio-{secrets.token_hex(4)}"
         
         try:
             # Create bucket
@@ -179,14 +444,13 @@ class SpeechClient:
                     CreateBucketConfiguration={'LocationConstraint': self.aws_region}
                 )
             
-            self._temp_bucket = bucket_name
             logger.debug(f"Created S3 bucket: {bucket_name}")
             return bucket_name
             
         except ClientError as e:
             if e.response['Error']['Code'] == 'BucketAlreadyExists':
                 # Try with a different name
-                bucket_name = f"stt-cli-audio-{uuid.uuid4().hex[:12]}"
+                bucket_name = f"stt-cli-audio-{secrets.token_hex(6)}"
                 if self.aws_region == 'us-east-1':
                     self.s3_client.create_bucket(Bucket=bucket_name)
                 else:
@@ -194,22 +458,24 @@ class SpeechClient:
                         Bucket=bucket_name,
                         CreateBucketConfiguration={'LocationConstraint': self.aws_region}
                     )
-                self._temp_bucket = bucket_name
                 return bucket_name
             else:
                 raise ValueError(f"Failed to create S3 bucket: {e}")
     
-    def _upload_to_s3(self, content: bytes, media_format: str) -> str:
-        """Upload audio content to S3 and return the URI."""
+    def _upload_to_s3(self, fileobj: BinaryIO, media_format: str) -> str:
+        """Stream audio from a file object to S3 and return the URI."""
+        from botocore.exceptions import ClientError
+        
         bucket_name = self._get_or_create_bucket()
-        filename = f"audio-{uuid.uuid4().hex}.{media_format}"
+        filename = f"audio-{secrets.token_hex(16)}.{media_format}"
         
         try:
-            self.s3_client.put_object(
-                Bucket=bucket_name,
-                Key=filename,
-                Body=content,
-                ContentType=f"audio/{media_format}"
+            self.s3_client.upload_fileobj(
+                fileobj,
+                bucket_name,
+                filename,
+                ExtraArgs={'ContentType': f"audio/{media_format}"},
+                Config=_upload_config(),
             )
             
             uri = f"s3://{bucket_name}/{filename}"
@@ -235,32 +501,61 @@ class SpeechClient:
     def _wait_for_completion(self, job_name: str, timeout: int = 600) -> dict:
         """Wait for transcription job to complete."""
         start_time = time.time()
+        delays = _poll_delays()
         
         while time.time() - start_time < timeout:
-            try:
-                response = self.transcribe_client.get_transcription_job(
-                    TranscriptionJobName=job_name
-                )
-                
-                status = response['TranscriptionJob']['TranscriptionJobStatus']
-                
-                if status == 'COMPLETED':
-                    logger.info(f"Transcription job {job_name} completed")
-                    return response['TranscriptionJob']
-                elif status == 'FAILED':
-                    reason = response['TranscriptionJob'].get('FailureReason', 'Unknown error')
-                    raise ValueError(f"Transcription job failed: {reason}")
-                
-                # Wait before checking again
-                time.sleep(5)
-                
-            except Exception as e:
-                if 'does not exist' in str(e).lower():
-                    raise ValueError(f"Transcription job {job_name} not found")
-                raise e
+            result = self._check_job(job_name)
+            if result is not None:
+                return result
+            
+            # Wait before checking again
+            time.sleep(next(delays))
+        
+        raise TimeoutError(f"Transcription job {job_name} timed out after {timeout} seconds")
+    
+    async def _wait_for_completion_async(self, job_name: str, timeout: int = 600) -> dict:
+        """Wait for transcription job to complete without blocking the event loop."""
+        start_time = time.time()
+        delays = _poll_delays()
+        
+        while time.time() - start_time < timeout:
+            result = await asyncio.to_thread(self._check_job, job_name)
+            if result is not None:
+                return result
+            
+            await asyncio.sleep(next(delays))
         
         raise TimeoutError(f"Transcription job {job_name} timed out after {timeout} seconds")
     
+    def _check_job(self, job_name: str) -> Optional[dict]:
+        """Check the status of a transcription job.
+
+        Returns:
+            The job description once completed, or None while still running
+
+        Raises:
+            ValueError: If the job failed or doesn't exist
+        """
+        try:
+            response = self.transcribe_client.get_transcription_job(
+                TranscriptionJobName=job_name
+            )
+        except Exception as e:
+            if 'does not exist' in str(e).lower():
+                raise ValueError(f"Transcription job {job_name} not found")
+            raise e
+        
+        status = response['TranscriptionJob']['TranscriptionJobStatus']
+        
+        if status == 'COMPLETED':
+            logger.info(f"Transcription job {job_name} completed")
+            return response['TranscriptionJob']
+        elif status == 'FAILED':
+            reason = response['TranscriptionJob'].get('FailureReason', 'Unknown error')
+            raise ValueError(f"Transcription job failed: {reason}")
+        
+        return None
+    
     def _parse_response(self, job_result: dict) -> list[TranscriptionResult]:
         """Parse AWS Transcribe response into TranscriptionResult objects."""
         results = []
@@ -271,7 +566,9 @@ class SpeechClient:
         # Download and parse transcript
         import urllib.request
         with urllib.request.urlopen(transcript_uri) as response:
-            transcript_data = json.loads(response.read().decode())
+            body = response.read()
+        # Both parsers accept the UTF-8 bytes directly, no decode needed
+        transcript_data = orjson.loads(body) if orjson is not None else json.loads(body)
         
         # Extract language code
         language_code = job_result.get('LanguageCode', 'unknown')
@@ -282,30 +579,40 @@ class SpeechClient:
             speaker_segments = transcript_data['results']['speaker_labels']['segments']
             items = transcript_data['results']['items']
             
+            # Timed words sorted by start time, so each segment's words are
+            # found with two binary searches instead of a scan of all items
+            timed_items = sorted(
+                (
+                    (float(item['start_time']), item)
+                    for item in items
+                    if item['type'] == 'pronunciation' and 'start_time' in item
+                ),
+                key=itemgetter(0),
+            )
+            item_starts = [start for start, _ in timed_items]
+            
             for segment in speaker_segments:
                 speaker_label = segment['speaker_label']
                 start_time = float(segment['start_time'])
                 end_time = float(segment['end_time'])
                 
-                # Find corresponding words/items
-                segment_items = []
-                for item in items:
-                    if item['type'] == 'pronunciation' and 'start_time' in item:
-                        item_start = float(item['start_time'])
-                        if start_time <= item_start <= end_time:
-                            segment_items.append(item)
+                # Find corresponding words/items (start_time <= start <= end_time)
+                lo = bisect_left(item_starts, start_time)
+                hi = bisect_right(item_starts, end_time, lo)
+                segment_items = [item for _, item in timed_items[lo:hi]]
                 
                 if segment_items:
                     # Build transcript from items
                     transcript_parts = []
-                    confidences = []
+                    total_confidence = 0.0
                     
                     for item in segment_items:
-                        transcript_parts.append(item['alternatives'][0]['content'])
-                        confidences.append(float(item['alternatives'][0]['confidence']))
+                        content, confidence = _content_and_confidence(item['alternatives'][0])
+                        transcript_parts.append(content)
+                        total_confidence += float(confidence)
                     
                     transcript = ' '.join(transcript_parts)
-                    avg_confidence = sum(confidences) / len(confidences) if confidences else 0.0
+                    avg_confidence = total_confidence / len(segment_items)
                     
                     # Convert speaker_label to int (remove 'spk_' prefix)
                     try:
@@ -326,12 +633,14 @@ class SpeechClient:
                 
                 # Calculate average confidence
                 items = transcript_data['results']['items']
-                confidences = []
+                total_confidence = 0.0
+                word_count = 0
                 for item in items:
                     if item['type'] == 'pronunciation':
-                        confidences.append(float(item['alternatives'][0]['confidence']))
+                        total_confidence += float(item['alternatives'][0]['confidence'])
+                        word_count += 1
                 
-                avg_confidence = sum(confidences) / len(confidences) if confidences else 0.0
+                avg_confidence = total_confidence / word_count if word_count else 0.0
                 
                 results.append(TranscriptionResult(
                     transcript=full_transcript,
@@ -0,0 +1,98 @@
+"""Data types shared by the audio, transcription and output modules.
+
+These are kept free of AWS dependencies so that modules which only pass
+results around don't import boto3.
+"""
+
+import mmap
+import os
+from pathlib import Path
+from typing import BinaryIO, NamedTuple, Optional, Union
+
+
+class AudioConfig:
+    """Configuration for audio input.
+
+    Local audio is referenced by path rather than held in memory, so large
+    recordings are streamed from disk when uploaded. Audio produced on the
+    fly (e.g. by ffmpeg) is given as a readable ``stream`` instead. A
+    ``temporary`` local file was created for this run (e.g. audio copied
+    out of a video) and is deleted once it has been uploaded.
+    """
+
+    __slots__ = ("content_path", "stream", "uri", "media_format", "sample_rate", "size", "temporary")
+
+    def __init__(
+        self,
+        content_path: Optional[Path] = None,
+        uri: Optional[str] = None,
+        media_format: str = "mp3",
+        sample_rate: Optional[int] = None,
+        size: Optional[int] = None,
+        stream: Optional[BinaryIO] = None,
+        temporary: bool = False,
+    ):
+        self.content_path = content_path
+        self.stream = stream
+        self.uri = uri
+        self.media_format = media_format
+        self.sample_rate = sample_rate
+        if size is None and content_path is not None:
+            size = os.stat(content_path).st_size
+        self.size = size
+        self.temporary = temporary
+
+    @property
+    def size_mb(self) -> Optional[float]:
+        """Size of the local audio in MB, or None if unknown (e.g. streamed)."""
+        if self.size is None:
+            return None
+        return self.size / (1024 * 1024)
+
+    def open_content(self) -> BinaryIO:
+        """Open the local audio file for a single sequential read.
+
+        Where supported, the kernel is told the file will be read
+        sequentially so it can read ahead in large blocks.
+
+        Returns:
+            Binary file object positioned at the start of the audio
+        """
+        if self.content_path is None:
+            raise ValueError("No local audio file to open")
+        f = open(self.content_path, 'rb')
+        if hasattr(os, 'posix_fadvise'):
+            try:
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            except OSError:
+                pass
+        return f
+
+    def load_bytes(self) -> Union[mmap.mmap, bytes]:
+        """Map the local audio content into memory.
+
+        The returned read-only memory map is backed by the page cache, so
+        no copy of the file is made; it supports ``len()``, slicing and the
+        buffer protocol. Close it when done.
+
+        Returns:
+            Memory map of the audio file (empty bytes for an empty file)
+        """
+        if self.content_path is None:
+            raise ValueError("No local audio file to load")
+        if not self.size:
+            return b""
+        with open(self.content_path, 'rb') as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if hasattr(mm, 'madvise'):
+            mm.madvise(mmap.MADV_SEQUENTIAL)
+        return mm
+
+
+class TranscriptionResult(NamedTuple):
+    """Result of speech transcription with speaker information."""
+
+    transcript: str
+    confidence: float
+    language_code: str
+    speaker_tag: Optional[int] = None
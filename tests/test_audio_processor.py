@@ -1,93 +1,311 @@
 """Test audio processor functionality."""
 
-import pytest
+import io
+import subprocess
+import sys
+import wave
+from contextlib import contextmanager
 from pathlib import Path
-from unittest.mock import Mock, mock_open, patch
+from unittest.mock import Mock, patch
+
+import pytest
+
+from stt_cli.audio_processor import AudioProcessor, FfmpegStream
+
+WAV_HEADER = b"RIFF\x24\x00\x00\x00WAVEfmt "
+M4A_HEADER = b"\x00\x00\x00\x20ftypM4A \x00\x00\x00\x00"
+HEIC_HEADER = b"\x00\x00\x00\x18ftypheic\x00\x00\x00\x00"
+MOV_HEADER = b"\x00\x00\x00\x14ftypqt  \x00\x00\x00\x00"
+MKV_HEADER = b"\x1aE\xdf\xa3\x9fB\x86\x81\x01B\xf7\x81"
 
-from stt_cli.audio_processor import AudioProcessor
-from google.cloud import speech_v1p1beta1 as speech
+
+def _fake_open(data: bytes):
+    """Return an ``open`` replacement that reads ``data`` from memory."""
+    @contextmanager
+    def fake_open(*args, **kwargs):
+        yield io.BytesIO(data)
+    return fake_open
+
+
+def _write_wav(path: Path, sample_rate: int = 16000) -> None:
+    """Write a short silent mono WAV file."""
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(b"\x00\x00" * 160)
 
 
 class TestAudioProcessor:
     """Test cases for AudioProcessor."""
-    
+
     def setup_method(self):
         """Set up test fixtures."""
         self.processor = AudioProcessor()
-    
+
     def test_supported_formats(self):
         """Test that supported formats are correctly identified."""
         supported = self.processor.get_supported_formats()
-        expected = ['.wav', '.flac', '.mp3', '.ogg', '.webm', '.amr', '.awb']
+        expected = ['.wav', '.flac', '.mp3', '.ogg', '.webm', '.amr', '.m4a']
         assert all(fmt in supported for fmt in expected)
-    
+
     def test_is_supported_format(self):
         """Test format detection."""
         assert self.processor.is_supported_format(Path("test.wav"))
         assert self.processor.is_supported_format(Path("test.mp3"))
         assert not self.processor.is_supported_format(Path("test.txt"))
         assert not self.processor.is_supported_format(Path("test.xyz"))
-    
-    def test_detect_encoding(self):
-        """Test encoding detection from file extension."""
-        # Test WAV files
-        encoding = self.processor._detect_encoding(Path("test.wav"))
-        assert encoding == speech.RecognitionConfig.AudioEncoding.LINEAR16
-        
-        # Test MP3 files
-        encoding = self.processor._detect_encoding(Path("test.mp3"))
-        assert encoding == speech.RecognitionConfig.AudioEncoding.MP3
-        
-        # Test unsupported format
-        encoding = self.processor._detect_encoding(Path("test.txt"))
-        assert encoding is None
-    
-    def test_detect_sample_rate(self):
-        """Test sample rate detection."""
-        # Test WAV/LINEAR16
-        rate = self.processor._detect_sample_rate(
-            Path("test.wav"), 
-            speech.RecognitionConfig.AudioEncoding.LINEAR16
-        )
-        assert rate == 16000
-        
-        # Test MP3
-        rate = self.processor._detect_sample_rate(
-            Path("test.mp3"), 
-            speech.RecognitionConfig.AudioEncoding.MP3
-        )
-        assert rate == 44100
-    
-    def test_detect_channels(self):
-        """Test channel detection."""
-        channels = self.processor._detect_channels(Path("test.wav"))
-        assert channels == 1  # Should always return mono for speech
-    
+
+    @patch("builtins.open", new=_fake_open(WAV_HEADER))
+    def test_is_supported_format_by_content(self):
+        """Test format detection from magic bytes for unknown extensions."""
+        assert self.processor.is_supported_format(Path("recording"))
+
+    @patch("builtins.open", new=_fake_open(b"just some text"))
+    def test_is_supported_format_unknown_content(self):
+        """Test that unrecognized content is not supported."""
+        assert not self.processor.is_supported_format(Path("notes"))
+
+    @patch("builtins.open", new=_fake_open(M4A_HEADER))
+    def test_is_supported_format_m4a_brand(self):
+        """Test that ISO media files with an audio brand are supported."""
+        assert self.processor.is_supported_format(Path("voice-memo"))
+
+    @pytest.mark.parametrize("header", [HEIC_HEADER, MOV_HEADER])
+    def test_iso_media_non_audio_brands_rejected(self, header):
+        """Test that images and video sharing the ISO container aren't audio."""
+        with patch("builtins.open", new=_fake_open(header)):
+            assert not self.processor.is_supported_format(Path("IMG_0001"))
+            assert not self.processor.is_processable(Path("IMG_0001"))
+
+    def test_process_file_heic_rejected(self, tmp_path):
+        """Test that a HEIC photo without a known extension isn't transcribed."""
+        image_file = tmp_path / "IMG_0001.HEIC"
+        image_file.write_bytes(HEIC_HEADER + b"\x00" * 64)
+
+        with pytest.raises(ValueError, match="Unsupported audio format"):
+            self.processor.process_file(image_file)
+
+    @patch("builtins.open", new=_fake_open(MKV_HEADER))
+    def test_matroska_content_is_video(self):
+        """Test that Matroska content is treated as video, not WebM audio."""
+        assert not self.processor.is_supported_format(Path("recording"))
+        assert self.processor.is_processable(Path("recording"))
+
+    def test_process_file_matroska_extracts_audio(self, tmp_path):
+        """Test that Matroska content without an extension goes through ffmpeg."""
+        video_file = tmp_path / "recording"
+        video_file.write_bytes(MKV_HEADER + b"\x00" * 64)
+
+        with patch.object(self.processor, "_extract_audio") as mock_extract:
+            config = self.processor.process_file(video_file)
+
+        mock_extract.assert_called_once_with(video_file)
+        assert config is mock_extract.return_value
+
+    def test_detect_format(self):
+        """Test media format detection from file extension."""
+        assert self.processor._detect_format(".wav") == "wav"
+        assert self.processor._detect_format(".mp3") == "mp3"
+        assert self.processor._detect_format(".m4a") == "mp4"
+        assert self.processor._detect_format(".txt") is None
+
+    def test_detect_sample_rate_defaults(self):
+        """Test sample rate fallbacks when the header can't be read."""
+        assert self.processor._detect_sample_rate(Path("missing.wav"), "wav") == 16000
+        assert self.processor._detect_sample_rate(Path("missing.amr"), "amr") == 8000
+        # Left to AWS to detect
+        assert self.processor._detect_sample_rate(Path("missing.mp3"), "mp3") is None
+
+    def test_detect_sample_rate_from_header(self, tmp_path):
+        """Test reading the sample rate from the file header."""
+        pytest.importorskip("soundfile")
+        audio_file = tmp_path / "test.wav"
+        _write_wav(audio_file, sample_rate=22050)
+
+        assert self.processor._detect_sample_rate(audio_file, "wav") == 22050
+
+    def test_detect_sample_rate_outside_transcribe_range(self, tmp_path):
+        """Test that rates AWS Transcribe rejects are left for it to detect."""
+        pytest.importorskip("soundfile")
+        audio_file = tmp_path / "test.wav"
+        _write_wav(audio_file, sample_rate=96000)
+
+        assert self.processor._detect_sample_rate(audio_file, "wav") is None
+        assert self.processor.process_file(audio_file).sample_rate is None
+
     @patch("pathlib.Path.exists")
     def test_process_file_not_exists(self, mock_exists):
         """Test processing non-existent file."""
         mock_exists.return_value = False
-        
+
         with pytest.raises(FileNotFoundError):
             self.processor.process_file(Path("nonexistent.wav"))
-    
+
     @patch("pathlib.Path.exists")
     def test_process_file_unsupported_format(self, mock_exists):
         """Test processing unsupported file format."""
         mock_exists.return_value = True
-        
+
         with pytest.raises(ValueError, match="Unsupported audio format"):
             self.processor.process_file(Path("test.txt"))
-    
-    @patch("pathlib.Path.exists")
-    @patch("builtins.open", new_callable=mock_open, read_data=b"fake audio data")
-    def test_process_file_success(self, mock_file, mock_exists):
+
+    def test_process_file_success(self, tmp_path):
         """Test successful file processing."""
-        mock_exists.return_value = True
-        
-        config = self.processor.process_file(Path("test.wav"))
-        
-        assert config.content == b"fake audio data"
-        assert config.encoding == speech.RecognitionConfig.AudioEncoding.LINEAR16
-        assert config.sample_rate_hertz == 16000
-        assert config.audio_channel_count == 1
\ No newline at end of file
+        audio_file = tmp_path / "test.wav"
+        _write_wav(audio_file)
+
+        config = self.processor.process_file(audio_file)
+
+        assert config.content_path == audio_file
+        assert config.stream is None
+        assert config.media_format == "wav"
+        assert config.sample_rate == 16000
+        assert config.size == audio_file.stat().st_size
+
+    def test_extract_audio_aac_copy_is_temporary(self, tmp_path):
+        """Test that AAC audio copied out of a video is marked for deletion."""
+        audio_file = tmp_path / "copied.m4a"
+        audio_file.write_bytes(M4A_HEADER)
+
+        with patch.object(self.processor, "_probe_audio_codec", return_value="aac"), \
+                patch.object(self.processor, "_run_ffmpeg", return_value=audio_file) as mock_run:
+            config = self.processor._extract_audio(Path("video.mov"))
+
+        mock_run.assert_called_once_with(Path("video.mov"), ["-vn", "-c:a", "copy"], ".m4a")
+        assert config.content_path == audio_file
+        assert config.media_format == "mp4"
+        assert config.temporary
+
+    @pytest.mark.parametrize("codec, output_args", [
+        ("mp3", ["-vn", "-c:a", "copy", "-f", "mp3"]),
+        ("opus", None),  # re-encoded
+        (None, None),  # codec unknown, re-encoded
+    ])
+    def test_extract_audio_streams_mp3(self, codec, output_args):
+        """Test that MP3 tracks are copied and other codecs re-encoded to MP3."""
+        stream = Mock(spec=FfmpegStream)
+        with patch.object(self.processor, "_probe_audio_codec", return_value=codec), \
+                patch.object(self.processor, "_stream_ffmpeg", return_value=stream) as mock_stream, \
+                patch.object(self.processor, "_run_ffmpeg") as mock_run:
+            config = self.processor._extract_audio(Path("video.mkv"))
+
+        mock_run.assert_not_called()
+        args = mock_stream.call_args.args[1]
+        if output_args is not None:
+            assert args == output_args
+        else:
+            assert "copy" not in args
+            assert args[-2:] == ["-f", "mp3"]
+        assert config.stream is stream
+        assert config.media_format == "mp3"
+        assert config.content_path is None
+
+    @patch("stt_cli.audio_processor._FFMPEG", "ffmpeg")
+    @patch("stt_cli.audio_processor.subprocess.run")
+    def test_run_ffmpeg_does_not_read_stdin(self, mock_run):
+        """Test that ffmpeg never reads the terminal, even with several running."""
+        mock_run.return_value = Mock(returncode=0, stdout="", stderr="")
+
+        audio_path = self.processor._run_ffmpeg(Path("video.mov"), ["-vn", "-c:a", "copy"], ".m4a")
+        audio_path.unlink()
+
+        cmd = mock_run.call_args.args[0]
+        assert "-nostdin" in cmd
+        assert mock_run.call_args.kwargs["stdin"] == subprocess.DEVNULL
+
+    @patch("stt_cli.audio_processor._FFPROBE", "ffprobe")
+    @patch("stt_cli.audio_processor.subprocess.run")
+    def test_probe_audio_codec(self, mock_run):
+        """Test reading the audio codec from ffprobe output."""
+        mock_run.return_value = Mock(returncode=0, stdout="aac\n", stderr="")
+        assert self.processor._probe_audio_codec(Path("video.mov")) == "aac"
+
+        mock_run.return_value = Mock(returncode=1, stdout="", stderr="bad input")
+        assert self.processor._probe_audio_codec(Path("video.mov")) is None
+
+    @patch("stt_cli.audio_processor._FFPROBE", None)
+    def test_probe_audio_codec_without_ffprobe(self):
+        """Test that a missing ffprobe leaves the codec undetermined."""
+        assert self.processor._probe_audio_codec(Path("video.mov")) is None
+
+    def test_process_file_without_extension(self, tmp_path):
+        """Test that files without an extension are identified by content."""
+        audio_file = tmp_path / "recording"
+        _write_wav(audio_file)
+
+        config = self.processor.process_file(audio_file)
+
+        assert config.media_format == "wav"
+
+
+def _ffmpeg_process(output=b"", returncode=0, running=False):
+    """Build a fake ffmpeg Popen object."""
+    process = Mock()
+    process.stdout = io.BytesIO(output)
+    process.wait.return_value = returncode
+    process.poll.return_value = None if running else returncode
+    return process
+
+
+class TestFfmpegStream:
+    """Test cases for FfmpegStream."""
+
+    def test_read_until_eof(self):
+        """Test reading ffmpeg output that completes successfully."""
+        stream = FfmpegStream(_ffmpeg_process(b"fake audio data"), io.BytesIO())
+
+        assert stream.read(4) == b"fake"
+        assert stream.read() == b" audio data"
+        assert stream.read() == b""
+        assert not stream.seekable()
+
+    def test_read_raises_on_ffmpeg_error(self):
+        """Test that a non-zero ffmpeg exit is raised at end of stream."""
+        process = _ffmpeg_process(b"partial", returncode=1)
+        stream = FfmpegStream(process, io.BytesIO(b"Invalid data found"))
+
+        assert stream.read() == b"partial"
+        with pytest.raises(RuntimeError, match="Invalid data found"):
+            stream.read()
+
+    def test_close_kills_running_process(self):
+        """Test that closing the stream stops ffmpeg and closes its output."""
+        process = _ffmpeg_process(running=True)
+        errors = io.BytesIO()
+
+        with FfmpegStream(process, errors):
+            pass
+
+        process.kill.assert_called_once()
+        process.wait.assert_called_once()
+        assert process.stdout.closed
+        assert errors.closed
+
+    def test_close_after_exit(self):
+        """Test that a finished ffmpeg process isn't killed."""
+        process = _ffmpeg_process()
+
+        FfmpegStream(process, io.BytesIO()).close()
+
+        process.kill.assert_not_called()
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="uses a shell script as ffmpeg")
+    def test_large_stderr_does_not_stall_output(self, tmp_path):
+        """Test that ffmpeg writing more than a pipe buffer of errors still finishes."""
+        fake_ffmpeg = tmp_path / "ffmpeg"
+        fake_ffmpeg.write_text(
+            "#!/bin/sh\n"
+            "head -c 1048576 /dev/zero | tr '\\0' x >&2\n"
+            "printf 'fake audio data'\n"
+            "exit 1\n"
+        )
+        fake_ffmpeg.chmod(0o755)
+
+        with patch("stt_cli.audio_processor._FFMPEG", str(fake_ffmpeg)):
+            stream = AudioProcessor()._stream_ffmpeg(Path("video.mkv"), ["-f", "mp3"])
+
+        with stream:
+            assert stream.read() == b"fake audio data"
+            with pytest.raises(RuntimeError, match="x{1000}"):
+                stream.read()
@@ -1,76 +1,152 @@
 """Test CLI functionality."""
 
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock, patch
+
+import click
 import pytest
 from click.testing import CliRunner
 
+from stt_cli.audio_processor import AudioProcessor
 from stt_cli.main import cli
+from stt_cli.types import AudioConfig, TranscriptionResult
+
+pytestmark = pytest.mark.filterwarnings("ignore::DeprecationWarning")
+
 
+@pytest.fixture(scope="module")
+def runner():
+    """Share one CliRunner across the module's tests."""
+    return CliRunner()
 
-def test_cli_help():
+
+def test_cli_help(runner):
     """Test that CLI help works."""
-    runner = CliRunner()
-    result = runner.invoke(cli, ["--help"])
+    result = runner.invoke(cli, ["--help"], catch_exceptions=False)
     assert result.exit_code == 0
     # DefaultGroup redirects to transcribe command help
     assert "Transcribe audio file with speaker diarization" in result.output
 
 
-def test_transcribe_help():
+def test_transcribe_help(runner):
     """Test that transcribe command help works."""
-    runner = CliRunner()
-    result = runner.invoke(cli, ["transcribe", "--help"])
+    result = runner.invoke(cli, ["transcribe", "--help"], catch_exceptions=False)
     assert result.exit_code == 0
     assert "Transcribe audio file with speaker diarization" in result.output
 
 
-def test_transcribe_missing_file():
+def test_transcribe_missing_file(runner):
     """Test transcribe command with missing audio file."""
-    runner = CliRunner()
-    result = runner.invoke(cli, ["transcribe", "nonexistent.wav"])
-    assert result.exit_code != 0
-    assert "does not exist" in result.output.lower()
-
-
-def test_transcribe_invalid_speakers():
+    result = runner.invoke(cli, ["transcribe", "nonexistent.wav"], standalone_mode=False)
+    assert isinstance(result.exception, click.BadParameter)
+    assert "does not exist" in result.exception.format_message().lower()
+
+
+@pytest.mark.parametrize("args, message", [
+    (["--min-speakers", "35"], "min-speakers must be between 1 and 30"),  # AWS limit
+    (["--min-speakers", "0"], "min-speakers must be between 1 and 30"),
+    (["--max-speakers", "0"], "max-speakers must be between 1 and 30"),
+    (["--min-speakers", "5", "--max-speakers", "3"], "cannot be greater than max-speakers"),
+])
+def test_transcribe_invalid_speakers(runner, tmp_path, args, message):
     """Test transcribe command with invalid speaker counts."""
-    runner = CliRunner()
-
-    # Test with min_speakers > 30 (AWS limit)
-    result = runner.invoke(cli, ["transcribe", "--min-speakers", "35", "test.wav"])
-    assert result.exit_code != 0
-
-    # Test with max_speakers < 1
-    result = runner.invoke(cli, ["transcribe", "--max-speakers", "0", "test.wav"])
-    assert result.exit_code != 0
-
-
-def test_transcribe_too_many_languages():
+    audio_file = tmp_path / "test.wav"
+    audio_file.write_bytes(b"")
+    result = runner.invoke(cli, ["transcribe", *args, str(audio_file)])
+    assert result.exit_code == 1
+    assert message in result.output
+
+
+@pytest.mark.parametrize("languages", [
+    ["en-US", "he-IL", "es-ES", "fr-FR", "de-DE"],  # 5th language should trigger the error
+    ["en-US", "he-IL", "es-ES", "fr-FR", "de-DE", "it-IT"],
+])
+def test_transcribe_too_many_languages(runner, tmp_path, languages):
     """Test transcribe command with too many languages."""
-    runner = CliRunner()
-    result = runner.invoke(cli, [
-        "transcribe",
-        "--languages", "en-US",
-        "--languages", "he-IL",
-        "--languages", "es-ES",
-        "--languages", "fr-FR",
-        "--languages", "de-DE",  # 5th language should trigger the error
-        "test.wav"
-    ])
-    assert result.exit_code != 0
+    audio_file = tmp_path / "test.wav"
+    audio_file.write_bytes(b"")
+    args = [arg for lang in languages for arg in ("--languages", lang)]
+    result = runner.invoke(cli, ["transcribe", *args, str(audio_file)])
+    assert result.exit_code == 1
+    assert "Maximum 4 languages allowed" in result.output
 
 
-def test_transcribe_help_shows_timeout_option():
+def test_transcribe_help_shows_timeout_option(runner):
     """Test that transcribe command help shows timeout option."""
-    runner = CliRunner()
-    result = runner.invoke(cli, ["transcribe", "--help"])
+    result = runner.invoke(cli, ["transcribe", "--help"], catch_exceptions=False)
     assert result.exit_code == 0
     assert "--timeout" in result.output
     assert "3600" in result.output  # default value
 
 
-def test_transcribe_timeout_option_accepted():
+def test_transcribe_timeout_option_accepted(runner):
     """Test that timeout option is accepted (doesn't error on missing file)."""
-    runner = CliRunner()
-    result = runner.invoke(cli, ["transcribe", "--timeout", "7200", "test.wav"])
+    result = runner.invoke(
+        cli, ["transcribe", "--timeout", "7200", "test.wav"], standalone_mode=False
+    )
     # Should fail because file doesn't exist, not because of invalid option
-    assert "does not exist" in result.output.lower()
\ No newline at end of file
+    assert isinstance(result.exception, click.BadParameter)
+    assert "does not exist" in result.exception.format_message().lower()
+
+
+def test_transcribe_batch_help(runner):
+    """Test that transcribe-batch command help works."""
+    result = runner.invoke(cli, ["transcribe-batch", "--help"], catch_exceptions=False)
+    assert result.exit_code == 0
+    assert "Transcribe all audio and video files in a directory" in result.output
+    assert "--jobs" in result.output
+
+
+def test_transcribe_batch_no_audio_files(runner, tmp_path):
+    """Test transcribe-batch on a directory without audio files."""
+    (tmp_path / "notes.txt").write_text("not audio")
+    result = runner.invoke(cli, ["transcribe-batch", str(tmp_path)])
+    assert result.exit_code != 0
+    assert "no supported audio or video files" in result.output.lower()
+
+
+def test_transcribe_batch_invalid_jobs(runner, tmp_path):
+    """Test transcribe-batch with an invalid worker count."""
+    (tmp_path / "test.wav").write_bytes(b"")
+    result = runner.invoke(cli, ["transcribe-batch", "--jobs", "0", str(tmp_path)])
+    assert result.exit_code == 1
+    assert "jobs must be at least 1" in result.output
+
+
+def test_transcribe_batch_writes_results(runner, tmp_path):
+    """Test that transcribe-batch writes one result per file and reports failures."""
+    for name in ("a.wav", "b.mp3", "c.wav"):
+        (tmp_path / name).write_bytes(b"")
+
+    def process_file(file_path):
+        if file_path.name == "a.wav":
+            # Finish last, so reporting has to wait for it
+            time.sleep(0.2)
+        if file_path.name == "b.mp3":
+            raise RuntimeError("damaged file")
+        return AudioConfig(uri=f"s3://test-bucket/{file_path.name}", media_format="wav")
+
+    speech_client = Mock()
+    speech_client.return_value.transcribe.return_value = [
+        TranscriptionResult("Hello world", 0.95, "en-US", 1)
+    ]
+
+    with patch.object(AudioProcessor, "process_file", side_effect=process_file), \
+            patch("stt_cli.speech_client.SpeechClient", speech_client), \
+            patch("concurrent.futures.ProcessPoolExecutor", ThreadPoolExecutor):
+        result = runner.invoke(
+            cli, ["transcribe-batch", "--jobs", "3", "--s3-bucket", "test-bucket", str(tmp_path)]
+        )
+
+    assert result.exit_code == 1
+    assert "Hello world" in (tmp_path / "a.wav.txt").read_text(encoding="utf-8")
+    assert "Hello world" in (tmp_path / "c.wav.txt").read_text(encoding="utf-8")
+    assert not (tmp_path / "b.mp3.txt").exists()
+
+    # Reported in input order, not completion order
+    a_pos = result.output.index("a.wav.txt")
+    b_pos = result.output.index(f"{tmp_path / 'b.mp3'}: damaged file")
+    c_pos = result.output.index("c.wav.txt")
+    assert a_pos < b_pos < c_pos
+    assert "1 of 3 files failed" in result.output
@@ -1,5 +1,6 @@
 """Test output formatter functionality."""
 
+import io
 import json
 import pytest
 
@@ -68,6 +69,12 @@ class TestOutputFormatter:
         assert "Speaker: Speaker 1" in output
         assert "Confidence: 95%" in output
     
+    def test_format_detailed_rounds_confidence(self):
+        """Test that confidence percentages are rounded, not truncated."""
+        results = [TranscriptionResult("Test", 0.289, "en-US", 1)]
+        output = self.formatter.format_result(results, "detailed")
+        assert "Confidence: 29%" in output
+
     def test_unsupported_format(self):
         """Test unsupported format type."""
         with pytest.raises(ValueError, match="Unsupported format type"):
@@ -86,4 +93,33 @@ class TestOutputFormatter:
         assert 1 in groups
         assert 2 in groups
         assert len(groups[1]) == 2  # Two segments from speaker 1
-        assert len(groups[2]) == 1  # One segment from speaker 2
\ No newline at end of file
+        assert len(groups[2]) == 1  # One segment from speaker 2
+
+    def test_summarize(self):
+        """Test the summary shared by the JSON and detailed formats."""
+        results = self.sample_results + [TranscriptionResult("...", 0.5, "unknown", None)]
+        summary = self.formatter._summarize(results)
+
+        assert summary.total_segments == 4
+        assert summary.speakers == 2
+        assert summary.languages == ("en-US", "he-IL")
+
+    def test_format_text_layout(self):
+        """Test that consecutive segments are grouped under one speaker label."""
+        results = self.sample_results + [TranscriptionResult("Fine", 0.9, "en-US", 1)]
+        output = self.formatter.format_result(results, "text")
+
+        assert output == (
+            "[Speaker 1]\nHello world\n\n"
+            "[Speaker 2]\nשלום עולם\n\n"
+            "[Speaker 1]\nHow are you?\nFine"
+        )
+
+    def test_format_json_to_stream(self):
+        """Test that streamed JSON matches the returned string."""
+        stream = io.StringIO()
+        result = self.formatter.format_result(self.sample_results, "json", stream=stream)
+
+        assert result is None
+        assert stream.getvalue() == self.formatter.format_result(self.sample_results, "json")
+        assert json.loads(stream.getvalue())["transcription"]["summary"]["total_segments"] == 3
@@ -0,0 +1,270 @@
+"""Test speech client functionality."""
+
+import asyncio
+import io
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock, patch
+
+import pytest
+from botocore.exceptions import ClientError
+
+from stt_cli import speech_client
+from stt_cli.speech_client import AudioConfig, SpeechClient
+
+
+def _item(content, start, confidence):
+    """Build a pronunciation item as found in AWS transcript JSON."""
+    return {
+        "type": "pronunciation",
+        "start_time": str(start),
+        "end_time": str(start + 0.4),
+        "alternatives": [{"content": content, "confidence": str(confidence)}],
+    }
+
+
+TRANSCRIPT = {
+    "results": {
+        "transcripts": [{"transcript": "Hello there. How are you?"}],
+        "speaker_labels": {
+            "segments": [
+                {"speaker_label": "spk_1", "start_time": "0.0", "end_time": "1.0"},
+                {"speaker_label": "spk_2", "start_time": "1.0", "end_time": "2.5"},
+                {"speaker_label": "spk_1", "start_time": "3.0", "end_time": "4.0"},
+            ]
+        },
+        "items": [
+            _item("Hello", 0.0, 0.9),
+            _item("there", 0.5, 0.7),
+            {"type": "punctuation", "alternatives": [{"content": ".", "confidence": "0.0"}]},
+            _item("How", 1.0, 1.0),
+            _item("are", 1.5, 0.8),
+            _item("you", 2.0, 0.6),
+        ],
+    }
+}
+
+
+class TestSpeechClient:
+    """Test cases for SpeechClient."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.client = SpeechClient(aws_region="us-east-1", bucket_name="test-bucket")
+        self.client.transcribe_client = Mock()
+        self.client.s3_client = Mock()
+        self.client.transcribe_client.get_transcription_job.return_value = {
+            "TranscriptionJob": {"TranscriptionJobStatus": "COMPLETED"}
+        }
+
+    def test_transcribe_uri(self):
+        """Test transcribing audio that is already in S3."""
+        audio_config = AudioConfig(uri="s3://test-bucket/audio.mp3")
+
+        with patch.object(self.client, "_parse_response", return_value=[]):
+            results = self.client.transcribe(audio_config)
+
+        assert results == []
+        job_config = self.client.transcribe_client.start_transcription_job.call_args.kwargs
+        assert job_config["Media"] == {"MediaFileUri": "s3://test-bucket/audio.mp3"}
+        assert job_config["IdentifyLanguage"] is True
+        assert job_config["LanguageOptions"] == ["he-IL", "en-US"]
+        self.client.s3_client.delete_object.assert_not_called()
+
+    def test_transcribe_uploads_and_cleans_up(self, tmp_path):
+        """Test transcription of a local file."""
+        audio_file = tmp_path / "audio.wav"
+        audio_file.write_bytes(b"fake audio data")
+        audio_config = AudioConfig(content_path=audio_file, media_format="wav")
+
+        pool = ThreadPoolExecutor(max_workers=1)
+        with patch.object(self.client, "_parse_response", return_value=[]), \
+                patch.object(speech_client, "_get_background_pool", return_value=pool):
+            results = self.client.transcribe(audio_config)
+        pool.shutdown(wait=True)
+
+        assert results == []
+        self.client.s3_client.upload_fileobj.assert_called_once()
+        self.client.s3_client.delete_object.assert_called_once()
+
+    def test_temporary_audio_deleted_after_upload(self, tmp_path):
+        """Test that audio extracted for this run is removed once uploaded."""
+        audio_file = tmp_path / "extracted.m4a"
+        audio_file.write_bytes(b"fake audio data")
+        audio_config = AudioConfig(content_path=audio_file, media_format="mp4", temporary=True)
+
+        uri, uploaded = self.client._prepare_audio(audio_config)
+
+        assert uploaded
+        self.client.s3_client.upload_fileobj.assert_called_once()
+        assert not audio_file.exists()
+
+    def test_transcribe_async_uploads_and_cleans_up(self, tmp_path):
+        """Test async transcription of a local file."""
+        audio_file = tmp_path / "audio.wav"
+        audio_file.write_bytes(b"fake audio data")
+        audio_config = AudioConfig(content_path=audio_file, media_format="wav")
+
+        with patch.object(self.client, "_parse_response", return_value=[]):
+            results = asyncio.run(
+                self.client.transcribe_async(audio_config, languages=["en-US"])
+            )
+
+        assert results == []
+        self.client.s3_client.upload_fileobj.assert_called_once()
+        job_config = self.client.transcribe_client.start_transcription_job.call_args.kwargs
+        assert job_config["LanguageCode"] == "en-US"
+        assert job_config["MediaFormat"] == "wav"
+        self.client.s3_client.delete_object.assert_called_once()
+
+    def _client_for_credentials(self, access_key, token=None, account="111122223333"):
+        """Build a client without a configured bucket for the given credentials."""
+        client = SpeechClient(aws_region="us-east-1")
+        client.s3_client = Mock()
+        client.session = Mock()
+        client.session.get_credentials.return_value = Mock(access_key=access_key, token=token)
+        client.session.client.return_value.get_caller_identity.return_value = {
+            "Account": account
+        }
+        return client
+
+    def test_temp_bucket_is_cached(self, tmp_path, monkeypatch):
+        """Test that an auto-created bucket is reused by later clients."""
+        monkeypatch.setattr(speech_client, "BUCKET_CACHE_PATH", tmp_path / "buckets.json")
+        client = self._client_for_credentials("AKIAEXAMPLE1")
+
+        bucket = client._get_or_create_bucket()
+        client.s3_client.create_bucket.assert_called_once()
+        assert speech_client._read_bucket_cache() == {"AKIAEXAMPLE1/us-east-1": bucket}
+
+        other = self._client_for_credentials("AKIAEXAMPLE1")
+        assert other._get_or_create_bucket() == bucket
+        other.s3_client.head_bucket.assert_called_once_with(Bucket=bucket)
+        other.s3_client.create_bucket.assert_not_called()
+        # Long-term keys need no STS lookup
+        other.session.client.assert_not_called()
+
+    def test_cached_bucket_is_per_credentials(self, tmp_path, monkeypatch):
+        """Test that a bucket cached for one access key isn't used by another."""
+        monkeypatch.setattr(speech_client, "BUCKET_CACHE_PATH", tmp_path / "buckets.json")
+        bucket = self._client_for_credentials("AKIAEXAMPLE1")._get_or_create_bucket()
+
+        other = self._client_for_credentials("AKIAEXAMPLE2")
+        assert other._get_or_create_bucket() != bucket
+        other.s3_client.create_bucket.assert_called_once()
+
+    def test_temporary_credentials_cache_bucket_by_account(self, tmp_path, monkeypatch):
+        """Test that rotating temporary credentials share the account's bucket."""
+        monkeypatch.setattr(speech_client, "BUCKET_CACHE_PATH", tmp_path / "buckets.json")
+        bucket = self._client_for_credentials("ASIAEXAMPLE1", token="t1")._get_or_create_bucket()
+        assert speech_client._read_bucket_cache() == {"111122223333/us-east-1": bucket}
+
+        other = self._client_for_credentials("ASIAEXAMPLE2", token="t2")
+        assert other._get_or_create_bucket() == bucket
+        other.session.client.assert_called_once_with("sts")
+        other.s3_client.create_bucket.assert_not_called()
+
+    @pytest.mark.parametrize("code", ["404", "403"])
+    def test_stale_cached_bucket_is_replaced(self, tmp_path, monkeypatch, code):
+        """Test that a deleted or foreign cached bucket is replaced before upload."""
+        monkeypatch.setattr(speech_client, "BUCKET_CACHE_PATH", tmp_path / "buckets.json")
+        speech_client._write_bucket_cache("AKIAEXAMPLE1/us-east-1", "stt-cli-audio-gone")
+        client = self._client_for_credentials("AKIAEXAMPLE1")
+        client.s3_client.head_bucket.side_effect = ClientError(
+            {"Error": {"Code": code}}, "HeadBucket"
+        )
+
+        bucket = client._get_or_create_bucket()
+
+        assert bucket != "stt-cli-audio-gone"
+        client.s3_client.create_bucket.assert_called_once()
+        assert speech_client._read_bucket_cache() == {"AKIAEXAMPLE1/us-east-1": bucket}
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+    def test_clients_not_inherited_by_forked_child(self):
+        """Test that a forked child doesn't reuse the parent's clients or pool."""
+        assert speech_client._get_clients.cache_info().currsize > 0
+        speech_client._get_background_pool()
+
+        pid = os.fork()
+        if pid == 0:
+            inherited = speech_client._get_clients.cache_info().currsize
+            os._exit(inherited + (speech_client._background_pool is not None))
+        _, status = os.waitpid(pid, 0)
+
+        assert os.waitstatus_to_exitcode(status) == 0
+
+    def test_background_pool_is_shared(self):
+        """Test that clients share one cleanup pool instead of creating their own."""
+        assert speech_client._get_background_pool() is speech_client._get_background_pool()
+
+    def test_transcribe_failed_job(self):
+        """Test that a failed job raises an error."""
+        self.client.transcribe_client.get_transcription_job.return_value = {
+            "TranscriptionJob": {
+                "TranscriptionJobStatus": "FAILED",
+                "FailureReason": "Invalid media",
+            }
+        }
+
+        with pytest.raises(ValueError, match="Invalid media"):
+            self.client.transcribe(AudioConfig(uri="s3://test-bucket/audio.mp3"))
+
+    def test_wait_for_completion_backs_off(self):
+        """Test that polling delays grow between status checks."""
+        running = {"TranscriptionJob": {"TranscriptionJobStatus": "IN_PROGRESS"}}
+        completed = {"TranscriptionJob": {"TranscriptionJobStatus": "COMPLETED"}}
+        self.client.transcribe_client.get_transcription_job.side_effect = [
+            running, running, running, completed
+        ]
+
+        with patch("stt_cli.speech_client.time.sleep") as mock_sleep:
+            job = self.client._wait_for_completion("job", timeout=60)
+
+        assert job == completed["TranscriptionJob"]
+        delays = [call.args[0] for call in mock_sleep.call_args_list]
+        assert len(delays) == 3
+        assert 1.0 <= delays[0] <= 1.25
+        assert delays[0] < delays[1] < delays[2] <= 15.0 * 1.25
+
+    def _parse(self, transcript, language_code="en-US"):
+        """Run _parse_response against an in-memory transcript."""
+        job_result = {
+            "TranscriptionJobName": "job",
+            "LanguageCode": language_code,
+            "Transcript": {"TranscriptFileUri": "https://example.com/transcript.json"},
+        }
+        body = io.BytesIO(json.dumps(transcript).encode())
+        with patch("urllib.request.urlopen", return_value=body):
+            return self.client._parse_response(job_result)
+
+    def test_parse_response_speaker_segments(self):
+        """Test assigning words to speaker segments."""
+        results = self._parse(TRANSCRIPT)
+
+        # Segments without words are dropped; words on a boundary count
+        # towards every segment they fall in
+        assert [r.transcript for r in results] == ["Hello there How", "How are you"]
+        assert [r.speaker_tag for r in results] == [1, 2]
+        assert results[0].confidence == pytest.approx((0.9 + 0.7 + 1.0) / 3)
+        assert results[1].confidence == pytest.approx((1.0 + 0.8 + 0.6) / 3)
+        assert all(r.language_code == "en-US" for r in results)
+        self.client.transcribe_client.delete_transcription_job.assert_called_once_with(
+            TranscriptionJobName="job"
+        )
+
+    def test_parse_response_without_speakers(self):
+        """Test parsing a transcript without speaker labels."""
+        transcript = {
+            "results": {
+                "transcripts": TRANSCRIPT["results"]["transcripts"],
+                "items": TRANSCRIPT["results"]["items"],
+            }
+        }
+        results = self._parse(transcript)
+
+        assert len(results) == 1
+        assert results[0].transcript == "Hello there. How are you?"
+        assert results[0].speaker_tag is None
+        assert results[0].confidence == pytest.approx((0.9 + 0.7 + 1.0 + 0.8 + 0.6) / 5)
@@ -0,0 +1,38 @@
+"""Test shared data types."""
+
+import mmap
+
+import pytest
+
+from stt_cli.types import AudioConfig
+
+
+class TestAudioConfig:
+    """Test cases for AudioConfig."""
+
+    def test_load_bytes_maps_file(self, tmp_path):
+        """Test that local audio is returned as a read-only memory map."""
+        audio_file = tmp_path / "test.wav"
+        audio_file.write_bytes(b"RIFF fake audio data")
+
+        content = AudioConfig(content_path=audio_file, media_format="wav").load_bytes()
+        try:
+            assert isinstance(content, mmap.mmap)
+            assert len(content) == 20
+            assert content[:] == b"RIFF fake audio data"
+            with pytest.raises(TypeError):
+                content[0:4] = b"XXXX"
+        finally:
+            content.close()
+
+    def test_load_bytes_empty_file(self, tmp_path):
+        """Test that an empty file, which can't be mapped, loads as empty bytes."""
+        audio_file = tmp_path / "empty.wav"
+        audio_file.write_bytes(b"")
+
+        assert AudioConfig(content_path=audio_file, media_format="wav").load_bytes() == b""
+
+    def test_load_bytes_without_local_file(self):
+        """Test that audio given by URI has no local content to load."""
+        with pytest.raises(ValueError):
+            AudioConfig(uri="s3://bucket/audio.wav").load_bytes()